@@ -3,27 +3,143 @@ from flask_cors import CORS
 import sys
 import os
 import json
+import threading
 from datetime import datetime
 
 # Add parent directory to path to import our analyzer
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from data_analysis import SilverArenaAnalyzer
+from data_analysis import SilverArenaAnalyzer, DEFAULT_VENUE, MARCH_5_EVENT
+from prediction_service import (PredictionBatcher, parse_prediction_request, check_event_labels,
+                                format_prediction)
+from historical_query import HistoricalIndex, parse_query_args
+from payloads import PayloadBuilder
+from venue_pool import VenuePool
+from live_demand import LiveTrackers, create_live_blueprint
+from live_push import Broadcaster, create_stream_blueprint, live_metrics
 
 app = Flask(__name__)
-CORS(app)
+# Expose the pagination cursor header to the dashboard
+CORS(app, expose_headers=['X-Next-Cursor'])
 
-# Global analyzer instance
-analyzer = None
-analysis_report = None
+data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'Demand Planning - Case Data Final 2023.xlsx')
+known_venues = None
+known_venues_lock = threading.Lock()
+warmup_thread = None
 
-def initialize_analyzer():
-    """Initialize the analyzer and run the analysis"""
-    global analyzer, analysis_report
-    if analyzer is None:
-        data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'Demand Planning - Case Data Final 2023.xlsx')
-        analyzer = SilverArenaAnalyzer(data_path)
-        analysis_report = analyzer.run_full_analysis()
-    return analyzer, analysis_report
+# Sections served straight from the shared payload builder
+SUMMARY_SECTIONS = [
+    'overview',
+    'event_performance',
+    'stand_performance',
+    'march5_predictions',
+    'staffing_recommendations',
+    'risk_assessment'
+]
+
+# Seconds clients are told to wait while the analyzer warms up
+WARMUP_RETRY_AFTER = 5
+
+# Venues whose frames and models stay in memory; the least recently used is evicted beyond this
+MAX_VENUES = int(os.environ.get('SILVER_ARENA_MAX_VENUES', 4))
+
+def load_venue(venue):
+    """Run the full analysis for one venue and build everything its endpoints serve"""
+    analyzer = SilverArenaAnalyzer(data_path, venue=venue)
+    report = analyzer.run_full_analysis()
+    return {
+        'analyzer': analyzer,
+        'report': report,
+        'loaded_at': datetime.now().isoformat(),
+        'historical_index': HistoricalIndex(analyzer.historical_columns()),
+        # Historical rows are served from the index, so only the summary sections are built
+        'payloads': PayloadBuilder(analyzer, report).build(SUMMARY_SECTIONS)
+    }
+
+# Per-venue state, published only once fully built
+venues = VenuePool(load_venue, MAX_VENUES)
+
+def initialize_analyzer(venue=DEFAULT_VENUE):
+    """Initialize a venue's analyzer once; concurrent callers wait for the single in-flight build"""
+    state = venues.get(venue)
+    return state['analyzer'], state['report']
+
+def venue_names():
+    """Venues in the workbook, looked up once; concurrent first callers wait for the single lookup"""
+    global known_venues
+    with known_venues_lock:
+        if known_venues is None:
+            known_venues = SilverArenaAnalyzer(data_path).venues()
+        return known_venues
+
+def request_venue():
+    """Venue named by the request's venue parameter, or the default venue"""
+    return request.args.get('venue') or DEFAULT_VENUE
+
+def venue_state():
+    """Loaded state of the request's venue"""
+    return venues.get(request_venue())
+
+def warm_up():
+    """Build the default venue in the background so the first request does not pay for it"""
+    try:
+        # Parses the workbook once and writes its snapshot, which the default venue's load then reads
+        venue_names()
+        initialize_analyzer()
+        print("Analyzer warm-up complete")
+    except Exception as e:
+        # Requests fall back to lazy initialization, which retries the build
+        print(f"Analyzer warm-up failed: {e}")
+
+def start_warm_up():
+    """Start the eager background warm-up"""
+    global warmup_thread
+    warmup_thread = threading.Thread(target=warm_up, name='analyzer-warmup', daemon=True)
+    warmup_thread.start()
+
+# Concurrent scenario requests share one predict call per set of loaded models
+prediction_batcher = PredictionBatcher()
+
+@app.before_request
+def reject_unknown_venue():
+    """Answer 404 for venues that are not in the workbook"""
+    # The default venue needs no lookup, so the warm-up check below answers at once
+    if request.method == 'OPTIONS' or request.endpoint == 'home' or request_venue() == DEFAULT_VENUE:
+        return None
+    try:
+        if request_venue() not in venue_names():
+            return jsonify({"error": f"Unknown venue: {request_venue()}"}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return None
+
+@app.before_request
+def reject_while_warming_up():
+    """Answer 503 with Retry-After instead of blocking requests behind the warm-up"""
+    # The stream stays open through the warm-up and reports readiness itself
+    if request.method == 'OPTIONS' or request.endpoint in ('home', 'push.stream_metrics') or request_venue() != DEFAULT_VENUE:
+        return None
+    if venues.peek(DEFAULT_VENUE) is None and warmup_thread is not None and warmup_thread.is_alive():
+        response = jsonify({"error": "Analyzer is warming up, please retry shortly"})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(WARMUP_RETRY_AFTER)
+        return response
+    return None
+
+# In-event POS ingest, tracked against the March 5th interval forecast
+live_trackers = LiveTrackers(
+    lambda venue: venues.get(venue)['payloads']['staffing_recommendations'],
+    datetime.fromisoformat(f"{MARCH_5_EVENT['Calendar Date']}T{MARCH_5_EVENT['Event Time']}").timestamp()
+)
+app.register_blueprint(create_live_blueprint(request_venue, live_trackers))
+
+def snapshot_version(venue):
+    """Identifies a venue's loaded analysis, or None while it is still being built"""
+    state = venues.peek(venue)
+    return {"ready": True, "generated_at": state['loaded_at']} if state else None
+
+# One push loop serves every open dashboard
+broadcaster = Broadcaster(live_metrics(live_trackers, snapshot_version))
+app.register_blueprint(create_stream_blueprint(request_venue, broadcaster))
 
 @app.route('/')
 def home():
@@ -31,6 +147,8 @@ def home():
     return jsonify({
         "status": "healthy",
         "message": "Silver Arena Analytics API",
+        "analyzer_ready": venues.peek(DEFAULT_VENUE) is not None,
+        "venues_loaded": venues.venues(),
         "timestamp": datetime.now().isoformat()
     })
 
@@ -38,29 +156,7 @@ def home():
 def get_analysis_overview():
     """Get high-level analysis overview"""
     try:
-        analyzer, report = initialize_analyzer()
-        
-        # Calculate summary statistics
-        combined_data = analyzer.combined_data
-        
-        overview = {
-            "total_events_analyzed": len(combined_data),
-            "date_range": {
-                "start": combined_data['Calendar Date'].min().isoformat(),
-                "end": combined_data['Calendar Date'].max().isoformat()
-            },
-            "event_types": combined_data['EventTypeName'].unique().tolist(),
-            "avg_attendance": round(combined_data['Total Attendance'].mean()),
-            "avg_transactions": round(combined_data['Transactions'].mean()),
-            "avg_sales": round(combined_data['Net Sales'].mean(), 2),
-            "key_metrics": {
-                "transactions_per_attendee": round(combined_data['Trans_Per_Attendee'].mean(), 3),
-                "sales_per_attendee": round(combined_data['Sales_Per_Attendee'].mean(), 2),
-                "sales_per_transaction": round(combined_data['Sales_Per_Transaction'].mean(), 2)
-            }
-        }
-        
-        return jsonify(overview)
+        return jsonify(venue_state()['payloads']['overview'])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -68,47 +164,7 @@ def get_analysis_overview():
 def get_event_performance():
     """Get event performance breakdown by type and day"""
     try:
-        analyzer, report = initialize_analyzer()
-        combined_data = analyzer.combined_data
-        
-        # Event type performance
-        event_type_stats = combined_data.groupby('EventTypeName').agg({
-            'Total Attendance': ['mean', 'std', 'count'],
-            'Transactions': ['mean', 'std'],
-            'Net Sales': ['mean', 'std'],
-            'Units': ['mean', 'std']
-        }).round(2)
-        
-        event_type_performance = {}
-        for event_type in event_type_stats.index:
-            event_type_performance[event_type] = {
-                "avg_attendance": event_type_stats.loc[event_type, ('Total Attendance', 'mean')],
-                "attendance_std": event_type_stats.loc[event_type, ('Total Attendance', 'std')],
-                "event_count": event_type_stats.loc[event_type, ('Total Attendance', 'count')],
-                "avg_transactions": event_type_stats.loc[event_type, ('Transactions', 'mean')],
-                "avg_sales": event_type_stats.loc[event_type, ('Net Sales', 'mean')],
-                "avg_units": event_type_stats.loc[event_type, ('Units', 'mean')]
-            }
-        
-        # Day of week performance
-        dow_stats = combined_data.groupby('DayOfWeek').agg({
-            'Total Attendance': 'mean',
-            'Transactions': 'mean',
-            'Net Sales': 'mean'
-        }).round(2)
-        
-        dow_performance = {}
-        for day in dow_stats.index:
-            dow_performance[day] = {
-                "avg_attendance": dow_stats.loc[day, 'Total Attendance'],
-                "avg_transactions": dow_stats.loc[day, 'Transactions'],
-                "avg_sales": dow_stats.loc[day, 'Net Sales']
-            }
-        
-        return jsonify({
-            "event_type_performance": event_type_performance,
-            "day_of_week_performance": dow_performance
-        })
+        return jsonify(venue_state()['payloads']['event_performance'])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -116,36 +172,7 @@ def get_event_performance():
 def get_stand_performance():
     """Get stand performance analysis"""
     try:
-        analyzer, report = initialize_analyzer()
-        
-        # Get stand performance data
-        stand_summary = analyzer.stand_pos.groupby('Stand Group').agg({
-            'Transactions': ['sum', 'mean'],
-            'Net Sales': ['sum', 'mean'],
-            'Units': ['sum', 'mean'],
-            'Total POS': 'mean'
-        }).round(2)
-        
-        stand_efficiency = analyzer.stand_pos.groupby('Stand Group').agg({
-            'Trans Per POS': 'mean',
-            'Units Per Trans': 'mean'
-        }).round(3)
-        
-        stand_performance = {}
-        for stand_group in stand_summary.index:
-            stand_performance[stand_group] = {
-                "total_transactions": stand_summary.loc[stand_group, ('Transactions', 'sum')],
-                "avg_transactions": stand_summary.loc[stand_group, ('Transactions', 'mean')],
-                "total_sales": stand_summary.loc[stand_group, ('Net Sales', 'sum')],
-                "avg_sales": stand_summary.loc[stand_group, ('Net Sales', 'mean')],
-                "total_units": stand_summary.loc[stand_group, ('Units', 'sum')],
-                "avg_units": stand_summary.loc[stand_group, ('Units', 'mean')],
-                "avg_pos": stand_summary.loc[stand_group, ('Total POS', 'mean')],
-                "trans_per_pos": stand_efficiency.loc[stand_group, 'Trans Per POS'],
-                "units_per_trans": stand_efficiency.loc[stand_group, 'Units Per Trans']
-            }
-        
-        return jsonify(stand_performance)
+        return jsonify(venue_state()['payloads']['stand_performance'])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -153,23 +180,30 @@ def get_stand_performance():
 def get_march5_predictions():
     """Get predictions for March 5th game"""
     try:
-        analyzer, report = initialize_analyzer()
-        
-        return jsonify({
-            "event_details": report['event_details'],
-            "predictions": {
-                "transactions": round(report['predictions']['Transactions']),
-                "net_sales": round(report['predictions']['Net Sales'], 2),
-                "units": round(report['predictions']['Units']),
-                "pos_terminals": round(report['predictions']['Total POS'])
-            },
-            "derived_metrics": {
-                "trans_per_attendee": round(report['predictions']['Transactions'] / 10000, 3),
-                "sales_per_attendee": round(report['predictions']['Net Sales'] / 10000, 2),
-                "sales_per_transaction": round(report['predictions']['Net Sales'] / report['predictions']['Transactions'], 2)
-            },
-            "key_insights": report['key_insights']
-        })
+        return jsonify(venue_state()['payloads']['march5_predictions'])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/predictions', methods=['POST'])
+def create_prediction():
+    """Predict demand for a described event (what-if scenario)"""
+    try:
+        event = parse_prediction_request(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    event['Venue Name'] = request_venue()
+    try:
+        # Load a cold venue in this request's thread, never in the batcher thread every venue shares
+        predictor = venue_state()['analyzer']
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    try:
+        fallback_fields = check_event_labels(event, predictor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        predictions = prediction_batcher.predict(event, predictor)
+        return jsonify(format_prediction(event, predictions, predictor.staffing_basis(), fallback_fields))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -177,59 +211,24 @@ def get_march5_predictions():
 def get_staffing_recommendations():
     """Get staffing recommendations for March 5th"""
     try:
-        analyzer, report = initialize_analyzer()
-        
-        staffing_data = []
-        total_pos = 0
-        
-        for stand_group, info in report['staffing_recommendations'].items():
-            staff_info = {
-                "stand_group": stand_group,
-                "predicted_transactions": round(info['predicted_transactions']),
-                "pos_terminals_needed": int(info['pos_terminals_needed']),
-                "avg_trans_per_pos": round(info['avg_trans_per_pos'], 1)
-            }
-            staffing_data.append(staff_info)
-            total_pos += int(info['pos_terminals_needed'])
-        
-        return jsonify({
-            "staffing_by_stand": staffing_data,
-            "total_pos_needed": total_pos,
-            "total_cashiers_needed": total_pos,
-            "recommendations": [
-                "Focus staffing during peak pre-game and halftime periods",
-                "Monitor beverage and grill stands for highest transaction volumes",
-                "Have backup staff ready for unexpected demand spikes",
-                "Consider promoting higher-margin items to boost revenue per transaction"
-            ]
-        })
+        return jsonify(venue_state()['payloads']['staffing_recommendations'])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/historical-data')
 def get_historical_data():
-    """Get historical event data for charts"""
+    """Get historical event data for charts, optionally filtered, projected and paginated"""
     try:
-        analyzer, report = initialize_analyzer()
-        combined_data = analyzer.combined_data
-        
-        # Prepare data for charts
-        historical_data = []
-        for _, row in combined_data.iterrows():
-            historical_data.append({
-                "date": row['Calendar Date'].isoformat(),
-                "event_type": row['EventTypeName'],
-                "opponent": row['Opponent'],
-                "attendance": row['Total Attendance'],
-                "transactions": row['Transactions'],
-                "net_sales": round(row['Net Sales'], 2),
-                "units": row['Units'],
-                "day_of_week": row['DayOfWeek'],
-                "trans_per_attendee": round(row['Trans_Per_Attendee'], 3),
-                "sales_per_attendee": round(row['Sales_Per_Attendee'], 2)
-            })
-        
-        return jsonify(historical_data)
+        historical_index = venue_state()['historical_index']
+        try:
+            rows, next_cursor = historical_index.query(**parse_query_args(request.args))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        response = jsonify(rows)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -237,50 +236,15 @@ def get_historical_data():
 def get_risk_assessment():
     """Get risk assessment and opportunities"""
     try:
-        analyzer, report = initialize_analyzer()
-        combined_data = analyzer.combined_data
-        
-        # Calculate risk factors
-        nba_games = combined_data[combined_data['EventTypeName'] == 'NBA Regular Season']
-        avg_nba_attendance = nba_games['Total Attendance'].mean()
-        avg_nba_trans_per_attendee = nba_games['Trans_Per_Attendee'].mean()
-        
-        risk_assessment = {
-            "attendance_risk": {
-                "predicted_attendance": 10000,
-                "avg_nba_attendance": round(avg_nba_attendance),
-                "attendance_gap": round(avg_nba_attendance - 10000),
-                "risk_level": "Medium" if avg_nba_attendance - 10000 > 2000 else "Low"
-            },
-            "revenue_risk": {
-                "predicted_trans_per_attendee": round(report['predictions']['Transactions'] / 10000, 3),
-                "avg_nba_trans_per_attendee": round(avg_nba_trans_per_attendee, 3),
-                "performance_gap": round(avg_nba_trans_per_attendee - (report['predictions']['Transactions'] / 10000), 3)
-            },
-            "operational_risks": [
-                "Lower attendance may reduce economies of scale",
-                "Sunday afternoon timing may affect concession preferences",
-                "Potential for longer lines if understaffed",
-                "Weather could impact attendance and concession sales"
-            ],
-            "opportunities": [
-                "Family-friendly promotions for Sunday afternoon game",
-                "Focus on higher-margin items to boost per-transaction revenue",
-                "Implement mobile ordering to reduce wait times",
-                "Cross-sell complementary items at high-traffic stands"
-            ],
-            "mitigation_strategies": [
-                "Have flexible staffing model to adjust POS terminals as needed",
-                "Monitor real-time queue lengths and adjust staffing",
-                "Prepare promotional materials for slower-moving inventory",
-                "Ensure backup payment systems are available"
-            ]
-        }
-        
-        return jsonify(risk_assessment)
+        return jsonify(venue_state()['payloads']['risk_assessment'])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Optional eager warm-up at import, e.g. under a multi-worker WSGI server;
+# spawned training workers re-import this module as __mp_main__ and must not warm up
+if os.environ.get('SILVER_ARENA_EAGER_INIT') == '1' and __name__ != '__mp_main__':
+    start_warm_up()
+
 if __name__ == '__main__':
     print("Starting Silver Arena Analytics API...")
     print("Initializing data analysis...")
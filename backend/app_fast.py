@@ -1,48 +1,192 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
-import json
 import os
+import sys
+import hashlib
+import threading
 from datetime import datetime
+from urllib.parse import quote
+
+# Add parent directory to path so registered models can be loaded
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_analysis import SilverArenaAnalyzer, DEFAULT_VENUE, MARCH_5_EVENT, registry_dir_for
+from prediction_service import (PredictionBatcher, parse_prediction_request, check_event_labels,
+                                format_prediction, staffing_basis_from_rows)
+from historical_query import parse_query_args
+from cache_snapshot import CacheSnapshot
+from cache_refresh import CacheRefresher
+from workbook_watcher import WorkbookWatcher
+from venue_pool import VenuePool
+from live_demand import LiveTrackers, create_live_blueprint
+from live_push import Broadcaster, create_stream_blueprint, live_metrics
+from cache_results import cache_file_for
 
 app = Flask(__name__)
-CORS(app)
-
-# Global cache
-cache = None
-cache_file = os.path.join(os.path.dirname(__file__), 'analysis_cache.json')
-
-def load_cache():
-    """Load cached results from JSON file"""
-    global cache
-    if cache is None:
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r') as f:
-                cache = json.load(f)
-            print(f"Cache loaded from {cache_file}")
-        else:
-            print(f"Cache file not found: {cache_file}")
-            print("Run: python backend/cache_results.py to generate cache")
-            cache = {}
-    return cache
+# Expose the pagination cursor header to the dashboard
+CORS(app, expose_headers=['X-Next-Cursor'])
+
+data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'Demand Planning - Case Data Final 2023.xlsx')
+cache_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache_results.py')
+# Venues whose snapshots and models stay in memory; the least recently used is evicted beyond this
+MAX_VENUES = int(os.environ.get('SILVER_ARENA_MAX_VENUES', 4))
+
+# Current cache snapshot per venue; each is replaced wholesale, never mutated
+snapshots = VenuePool(lambda venue: CacheSnapshot.from_file(cache_file_for(venue)), MAX_VENUES)
+
+def load_venue_predictor(venue):
+    """Load a venue's latest registered models without touching the workbook, or None if none exist"""
+    analyzer = SilverArenaAnalyzer(data_path, venue=venue)
+    return analyzer if analyzer.load_latest_models() else None
+
+# Models from each venue's registry, loaded on its first scenario request
+predictors = VenuePool(load_venue_predictor, MAX_VENUES)
+
+# One background refresh job per venue
+refreshers = {}
+refreshers_lock = threading.Lock()
+
+def load_cache(venue=DEFAULT_VENUE):
+    """Return a venue's current cache snapshot, loading it from disk on first use"""
+    return snapshots.get(venue)
+
+def reload_cache(venue=DEFAULT_VENUE):
+    """Build a snapshot from the regenerated file and swap it in for new requests"""
+    new_snapshot = CacheSnapshot.from_file(cache_file_for(venue))
+    snapshots.put(venue, new_snapshot)
+    # Models may have been retrained with the cache; reload them on next use
+    predictors.discard(venue)
+    # Tell open dashboards now instead of at the next push tick
+    broadcaster.notify()
+    return new_snapshot.generated_at
+
+def refresher_for(venue):
+    """The cache refresher of a venue, created on first use"""
+    with refreshers_lock:
+        if venue not in refreshers:
+            refreshers[venue] = CacheRefresher(
+                [sys.executable, cache_script, '--venue', venue],
+                on_success=lambda: reload_cache(venue)
+            )
+        return refreshers[venue]
+
+def refresh_loaded_venues():
+    """Rebuild the cache of the default venue and of every venue currently in memory"""
+    for venue in dict.fromkeys([DEFAULT_VENUE] + snapshots.venues()):
+        refresher_for(venue).start(reason='workbook changed')
+
+def start_workbook_watcher():
+    """Rebuild the caches in the background whenever the source workbook changes"""
+    watcher = WorkbookWatcher(
+        data_path,
+        refresh_loaded_venues,
+        poll_interval=float(os.environ.get('SILVER_ARENA_WATCH_INTERVAL', 2)),
+        debounce=float(os.environ.get('SILVER_ARENA_WATCH_DEBOUNCE', 5))
+    )
+    watcher.start()
+    return watcher
+
+def venue_known(venue):
+    """Whether a venue has a cache file or registered models; fast mode never reads the workbook"""
+    return (venue == DEFAULT_VENUE or os.path.exists(cache_file_for(venue))
+            or os.path.exists(registry_dir_for(data_path, venue)))
+
+def request_venue():
+    """Venue named by the request's venue parameter, or the default venue"""
+    return request.args.get('venue') or DEFAULT_VENUE
+
+def staffing_basis(venue):
+    """Stand shares and efficiencies the venue's cached staffing plan was built from, or None without a cache"""
+    data = load_cache(venue).data
+    if 'staffing_basis' in data:
+        return data['staffing_basis']
+    if 'staffing_recommendations' in data:
+        return staffing_basis_from_rows(data['staffing_recommendations']['staffing_by_stand'])
+    return None
+
+def is_not_modified(snap, etag):
+    """Whether the request's validators show the client already has this representation"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    return (request.if_modified_since is not None and snap.last_modified is not None
+            and request.if_modified_since >= snap.last_modified.replace(microsecond=0))
+
+def add_validators(snap, response, etag):
+    """Attach ETag, Last-Modified and Cache-Control to a response"""
+    response.set_etag(etag)
+    response.last_modified = snap.last_modified
+    # Clients may keep the body but must revalidate, since a refresh can land at any time
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
+
+def conditional_response(snap, etag, build_payload):
+    """Serve a payload with validators, answering 304 without serializing when the client is current"""
+    response = app.response_class(status=304) if is_not_modified(snap, etag) else jsonify(build_payload())
+    return add_validators(snap, response, etag)
+
+def section_response(snap, name):
+    """Serve a cache section's pre-encoded body in the best encoding the client accepts"""
+    bodies = snap.bodies[name]
+    encoding = request.accept_encodings.best_match([e for e in ('br', 'gzip') if e in bodies]) or 'identity'
+    # Each encoding is a distinct representation, so it gets its own ETag
+    etag = snap.etags[name] if encoding == 'identity' else f"{snap.etags[name]}-{encoding}"
+    if is_not_modified(snap, etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(bodies[encoding], mimetype='application/json')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return add_validators(snap, response, etag)
+
+# Concurrent scenario requests share one predict call per set of loaded models
+prediction_batcher = PredictionBatcher()
+
+@app.before_request
+def reject_unknown_venue():
+    """Answer 404 for venues with neither a cache nor registered models"""
+    if request.method == 'OPTIONS' or request.endpoint == 'home':
+        return None
+    if not venue_known(request_venue()):
+        return jsonify({"error": f"Unknown venue: {request_venue()}"}), 404
+    return None
+
+# In-event POS ingest, tracked against the March 5th interval forecast
+live_trackers = LiveTrackers(
+    lambda venue: load_cache(venue).data.get('staffing_recommendations'),
+    datetime.fromisoformat(f"{MARCH_5_EVENT['Calendar Date']}T{MARCH_5_EVENT['Event Time']}").timestamp()
+)
+app.register_blueprint(create_live_blueprint(request_venue, live_trackers))
+
+def snapshot_version(venue):
+    """Identifies a venue's current snapshot, so dashboards refetch only the sections that changed"""
+    snap = load_cache(venue)
+    return {"ready": True, "generated_at": snap.generated_at, "etags": snap.etags}
+
+# One push loop serves every open dashboard
+broadcaster = Broadcaster(live_metrics(live_trackers, snapshot_version))
+app.register_blueprint(create_stream_blueprint(request_venue, broadcaster))
 
 @app.route('/')
 def home():
     """Health check endpoint"""
+    snapshot = snapshots.peek(DEFAULT_VENUE)
     return jsonify({
         "status": "healthy",
         "message": "Silver Arena Analytics API (Fast Mode)",
         "timestamp": datetime.now().isoformat(),
-        "cache_generated": cache.get('generated_at', 'Not available') if cache else 'Cache not loaded'
+        "cache_generated": (snapshot.generated_at or 'Not available') if snapshot else 'Cache not loaded',
+        "venues_loaded": snapshots.venues()
     })
 
 @app.route('/api/analysis/overview')
 def get_analysis_overview():
     """Get high-level analysis overview"""
     try:
-        data = load_cache()
-        if 'overview' not in data:
+        snap = load_cache(request_venue())
+        if 'overview' not in snap.data:
             return jsonify({"error": "Cache not available. Run cache_results.py first."}), 503
-        return jsonify(data['overview'])
+        return section_response(snap, 'overview')
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -50,10 +194,10 @@ def get_analysis_overview():
 def get_event_performance():
     """Get event performance breakdown by type and day"""
     try:
-        data = load_cache()
-        if 'event_performance' not in data:
+        snap = load_cache(request_venue())
+        if 'event_performance' not in snap.data:
             return jsonify({"error": "Cache not available. Run cache_results.py first."}), 503
-        return jsonify(data['event_performance'])
+        return section_response(snap, 'event_performance')
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -61,10 +205,10 @@ def get_event_performance():
 def get_stand_performance():
     """Get stand performance analysis"""
     try:
-        data = load_cache()
-        if 'stand_performance' not in data:
+        snap = load_cache(request_venue())
+        if 'stand_performance' not in snap.data:
             return jsonify({"error": "Cache not available. Run cache_results.py first."}), 503
-        return jsonify(data['stand_performance'])
+        return section_response(snap, 'stand_performance')
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -72,10 +216,36 @@ def get_stand_performance():
 def get_march5_predictions():
     """Get predictions for March 5th game"""
     try:
-        data = load_cache()
-        if 'march5_predictions' not in data:
+        snap = load_cache(request_venue())
+        if 'march5_predictions' not in snap.data:
             return jsonify({"error": "Cache not available. Run cache_results.py first."}), 503
-        return jsonify(data['march5_predictions'])
+        return section_response(snap, 'march5_predictions')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/predictions', methods=['POST'])
+def create_prediction():
+    """Predict demand for a described event (what-if scenario)"""
+    try:
+        event = parse_prediction_request(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    event['Venue Name'] = request_venue()
+    try:
+        predictor = predictors.get(event['Venue Name'])
+        basis = staffing_basis(event['Venue Name'])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    if predictor is None or basis is None:
+        predictors.discard(event['Venue Name'])
+        return jsonify({"error": "Models not available. Run cache_results.py first."}), 503
+    try:
+        fallback_fields = check_event_labels(event, predictor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        predictions = prediction_batcher.predict(event, predictor)
+        return jsonify(format_prediction(event, predictions, basis, fallback_fields))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -83,21 +253,33 @@ def get_march5_predictions():
 def get_staffing_recommendations():
     """Get staffing recommendations for March 5th"""
     try:
-        data = load_cache()
-        if 'staffing_recommendations' not in data:
+        snap = load_cache(request_venue())
+        if 'staffing_recommendations' not in snap.data:
             return jsonify({"error": "Cache not available. Run cache_results.py first."}), 503
-        return jsonify(data['staffing_recommendations'])
+        return section_response(snap, 'staffing_recommendations')
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/historical-data')
 def get_historical_data():
-    """Get historical event data for charts"""
+    """Get historical event data for charts, optionally filtered, projected and paginated"""
     try:
-        data = load_cache()
-        if 'historical_data' not in data:
+        snap = load_cache(request_venue())
+        if 'historical_data' not in snap.data:
             return jsonify({"error": "Cache not available. Run cache_results.py first."}), 503
-        return jsonify(data['historical_data'])
+        if not request.args.keys() - {'venue'}:
+            return section_response(snap, 'historical_data')
+        try:
+            rows, next_cursor = snap.historical_index.query(**parse_query_args(request.args))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        # A filtered view is fully determined by the section and the query string
+        etag = hashlib.sha256(f"{snap.etags['historical_data']}?{request.query_string.decode()}".encode()).hexdigest()[:32]
+        response = conditional_response(snap, etag, lambda: rows)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -105,50 +287,50 @@ def get_historical_data():
 def get_risk_assessment():
     """Get risk assessment and opportunities"""
     try:
-        data = load_cache()
-        if 'risk_assessment' not in data:
+        snap = load_cache(request_venue())
+        if 'risk_assessment' not in snap.data:
             return jsonify({"error": "Cache not available. Run cache_results.py first."}), 503
-        return jsonify(data['risk_assessment'])
+        return section_response(snap, 'risk_assessment')
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/cache/refresh')
+@app.route('/api/cache/refresh', methods=['GET', 'POST'])
 def refresh_cache():
-    """Refresh the cache by running analysis again"""
+    """Start regenerating the cache in the background; poll the status endpoint for the result"""
     try:
-        # Import and run cache generation
-        import subprocess
-        result = subprocess.run([
-            'python', 
-            os.path.join(os.path.dirname(__file__), 'cache_results.py')
-        ], capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            # Reload cache
-            global cache
-            cache = None
-            load_cache()
-            return jsonify({
-                "status": "success",
-                "message": "Cache refreshed successfully",
-                "generated_at": cache.get('generated_at', 'Unknown')
-            })
-        else:
-            return jsonify({
-                "status": "error",
-                "message": "Failed to refresh cache",
-                "error": result.stderr
-            }), 500
+        venue = request_venue()
+        job = refresher_for(venue).start()
+        return jsonify({
+            "status": "accepted",
+            "message": "Cache refresh running in the background",
+            "venue": venue,
+            "job": job,
+            "status_url": "/api/cache/refresh/status" + (f"?venue={quote(venue)}" if venue != DEFAULT_VENUE else '')
+        }), 202
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/cache/refresh/status')
+def refresh_cache_status():
+    """Get the state of the latest cache refresh job"""
+    snap = load_cache(request_venue())
+    return jsonify({
+        "venue": request_venue(),
+        "job": refresher_for(request_venue()).status(),
+        "generated_at": snap.generated_at or 'Unknown'
+    })
+
 if __name__ == '__main__':
     print("Starting Silver Arena Analytics API (Fast Mode)...")
     print("Loading cached results...")
-    load_cache()
-    if cache:
-        print(f"Cache loaded successfully (generated: {cache.get('generated_at', 'Unknown')})")
+    snapshot = load_cache()
+    if snapshot.data:
+        print(f"Cache loaded successfully (generated: {snapshot.generated_at or 'Unknown'})")
     else:
         print("No cache available. Generate cache first with: python backend/cache_results.py")
+    # The debug reloader runs this script twice; only the serving child watches
+    watch = '--watch' in sys.argv[1:] or os.environ.get('SILVER_ARENA_WATCH') == '1'
+    if watch and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_workbook_watcher()
     print("Starting server on http://localhost:5001")
     app.run(debug=True, host='0.0.0.0', port=5001) 
\ No newline at end of file
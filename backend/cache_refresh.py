@@ -0,0 +1,65 @@
+"""
+Background cache regeneration jobs for the fast backend
+"""
+
+import subprocess
+import threading
+from datetime import datetime
+
+class CacheRefresher:
+    """Runs cache generation off the request path, one job at a time"""
+    
+    def __init__(self, command, on_success):
+        self.command = command
+        self.on_success = on_success
+        self._lock = threading.Lock()
+        self._job = None
+        self._job_count = 0
+        self._rerun_reason = None
+        
+    def start(self, reason='manual'):
+        """Start a refresh, or join the running one and schedule a rerun after it"""
+        with self._lock:
+            if self._job is not None and self._job['status'] == 'running':
+                # Inputs may have changed after the running job read them
+                self._rerun_reason = reason
+                return dict(self._job)
+            return self._start_locked(reason)
+            
+    def status(self):
+        """Copy of the latest job's state"""
+        with self._lock:
+            return dict(self._job) if self._job else {'status': 'idle'}
+            
+    def _start_locked(self, reason):
+        """Create and launch a job; the caller holds the lock"""
+        self._job_count += 1
+        self._job = {
+            'id': self._job_count,
+            'status': 'running',
+            'reason': reason,
+            'started_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'generated_at': None,
+            'error': None
+        }
+        threading.Thread(target=self._run, args=(self._job,), name='cache-refresh', daemon=True).start()
+        return dict(self._job)
+        
+    def _run(self, job):
+        """Generate the cache in a subprocess and hand the result to on_success"""
+        updates = {}
+        try:
+            result = subprocess.run(self.command, capture_output=True, text=True)
+            if result.returncode == 0:
+                updates = {'status': 'succeeded', 'generated_at': self.on_success()}
+            else:
+                updates = {'status': 'failed', 'error': result.stderr[-2000:]}
+        except Exception as e:
+            updates = {'status': 'failed', 'error': str(e)}
+            
+        with self._lock:
+            job.update(updates, finished_at=datetime.now().isoformat())
+            if self._rerun_reason is not None:
+                reason, self._rerun_reason = self._rerun_reason, None
+                self._start_locked(reason)
@@ -6,259 +6,129 @@ Pre-compute all analysis results and cache them for fast API responses
 import json
 import sys
 import os
+import hashlib
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from data_analysis import SilverArenaAnalyzer
+from data_analysis import (SilverArenaAnalyzer, frame_fingerprint, venue_slug, replace_file, MODEL_INPUT_COLUMNS,
+                           MARCH_5_EVENT, DEFAULT_VENUE)
+from payloads import PayloadBuilder, SECTIONS, SECTION_INPUTS, clean_for_json
 
-def serialize_numpy(obj):
-    """Convert numpy types to Python native types for JSON serialization"""
-    if hasattr(obj, 'item'):
-        return obj.item()
-    elif hasattr(obj, 'tolist'):
-        return obj.tolist()
-    elif isinstance(obj, (int, float, str, bool, list, dict, type(None))):
-        return obj
-    else:
-        return str(obj)
+CACHE_FILE = os.path.join(os.path.dirname(__file__), 'analysis_cache.json')
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'Demand Planning - Case Data Final 2023.xlsx')
 
-def clean_for_json(data):
-    """Recursively clean data structure for JSON serialization"""
-    if isinstance(data, dict):
-        return {key: clean_for_json(value) for key, value in data.items()}
-    elif isinstance(data, list):
-        return [clean_for_json(item) for item in data]
-    else:
-        return serialize_numpy(data)
+# Bump when a section builder changes shape so old cached sections are rebuilt
+CACHE_VERSION = 7
 
-def generate_cache():
-    """Generate all cached results"""
-    print("🔄 Generating cached results...")
+# Columns the model inputs read, by frame
+MODEL_INPUTS = {
+    'combined_data': MODEL_INPUT_COLUMNS
+}
+
+def inputs_fingerprint(analyzer, frames, *params):
+    """Fingerprint the given frame columns together with any parameters"""
+    digest = hashlib.sha256(json.dumps([CACHE_VERSION, params], sort_keys=True).encode())
+    for frame_name, columns in sorted(frames.items()):
+        digest.update(frame_fingerprint(getattr(analyzer, frame_name), columns).encode())
+    return digest.hexdigest()
+
+def model_fingerprint(analyzer):
+    """Fingerprint of everything the March 5th predictions depend on"""
+    return inputs_fingerprint(analyzer, MODEL_INPUTS, MARCH_5_EVENT, analyzer.model_params())
+
+def section_fingerprints(analyzer):
+    """Fingerprint each cache section over its input sheets, columns and parameters"""
+    predictions_fp = model_fingerprint(analyzer)
+    fingerprints = {}
+    for section, inputs in SECTION_INPUTS.items():
+        params = [section, predictions_fp if inputs.get('predictions') else None, inputs.get('params')]
+        fingerprints[section] = inputs_fingerprint(analyzer, inputs['frames'], *params)
+    return fingerprints
+
+def cache_file_for(venue):
+    """Cache file of a venue; the default venue keeps the original file name"""
+    if venue == DEFAULT_VENUE:
+        return CACHE_FILE
+    return os.path.join(os.path.dirname(CACHE_FILE), f"analysis_cache.{venue_slug(venue)}.json")
+
+def load_previous_cache(cache_file):
+    """Load the existing cache file, if any"""
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def generate_cache(force=False, venue=DEFAULT_VENUE):
+    """Generate cached results for one venue, rebuilding only sections whose inputs changed"""
+    print(f"🔄 Generating cached results for {venue}...")
+    cache_file = cache_file_for(venue)
     
     # Initialize analyzer
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'Demand Planning - Case Data Final 2023.xlsx')
-    analyzer = SilverArenaAnalyzer(data_path)
-    
-    print("📊 Running full analysis...")
-    report = analyzer.run_full_analysis()
-    
-    # Prepare all cached data
-    cache = {
-        'generated_at': datetime.now().isoformat(),
-        'overview': {
-            'total_events_analyzed': len(analyzer.combined_data),
-            'date_range': {
-                'start': analyzer.combined_data['Calendar Date'].min().isoformat(),
-                'end': analyzer.combined_data['Calendar Date'].max().isoformat()
-            },
-            'event_types': analyzer.combined_data['EventTypeName'].unique().tolist(),
-            'avg_attendance': round(analyzer.combined_data['Total Attendance'].mean()),
-            'avg_transactions': round(analyzer.combined_data['Transactions'].mean()),
-            'avg_sales': round(analyzer.combined_data['Net Sales'].mean(), 2),
-            'key_metrics': {
-                'transactions_per_attendee': round(analyzer.combined_data['Trans_Per_Attendee'].mean(), 3),
-                'sales_per_attendee': round(analyzer.combined_data['Sales_Per_Attendee'].mean(), 2),
-                'sales_per_transaction': round(analyzer.combined_data['Sales_Per_Transaction'].mean(), 2)
-            }
-        },
-        
-        'event_performance': {
-            'event_type_performance': {},
-            'day_of_week_performance': {}
-        },
-        
-        'stand_performance': {},
-        
-        'march5_predictions': {
-            'event_details': report['event_details'],
-            'predictions': {
-                'transactions': round(report['predictions']['Transactions']),
-                'net_sales': round(report['predictions']['Net Sales'], 2),
-                'units': round(report['predictions']['Units']),
-                'pos_terminals': round(report['predictions']['Total POS'])
-            },
-            'derived_metrics': {
-                'trans_per_attendee': round(report['predictions']['Transactions'] / 10000, 3),
-                'sales_per_attendee': round(report['predictions']['Net Sales'] / 10000, 2),
-                'sales_per_transaction': round(report['predictions']['Net Sales'] / report['predictions']['Transactions'], 2)
-            },
-            'key_insights': report['key_insights']
-        },
-        
-        'staffing_recommendations': {
-            'staffing_by_stand': [],
-            'total_pos_needed': 0,
-            'total_cashiers_needed': 0,
-            'recommendations': [
-                "Focus staffing during peak pre-game and halftime periods",
-                "Monitor beverage and grill stands for highest transaction volumes",
-                "Have backup staff ready for unexpected demand spikes",
-                "Consider promoting higher-margin items to boost revenue per transaction"
-            ]
-        },
-        
-        'risk_assessment': {
-            'attendance_risk': {
-                'predicted_attendance': 10000,
-                'avg_nba_attendance': round(analyzer.combined_data[analyzer.combined_data['EventTypeName'] == 'NBA Regular Season']['Total Attendance'].mean()),
-                'attendance_gap': 0,
-                'risk_level': 'Medium'
-            },
-            'revenue_risk': {
-                'predicted_trans_per_attendee': round(report['predictions']['Transactions'] / 10000, 3),
-                'avg_nba_trans_per_attendee': round(analyzer.combined_data[analyzer.combined_data['EventTypeName'] == 'NBA Regular Season']['Trans_Per_Attendee'].mean(), 3),
-                'performance_gap': 0
-            },
-            'operational_risks': [
-                "Lower attendance may reduce economies of scale",
-                "Sunday afternoon timing may affect concession preferences",
-                "Potential for longer lines if understaffed",
-                "Weather could impact attendance and concession sales"
-            ],
-            'opportunities': [
-                "Family-friendly promotions for Sunday afternoon game",
-                "Focus on higher-margin items to boost per-transaction revenue",
-                "Implement mobile ordering to reduce wait times",
-                "Cross-sell complementary items at high-traffic stands"
-            ],
-            'mitigation_strategies': [
-                "Have flexible staffing model to adjust POS terminals as needed",
-                "Monitor real-time queue lengths and adjust staffing",
-                "Prepare promotional materials for slower-moving inventory",
-                "Ensure backup payment systems are available"
-            ]
-        },
-        
-        'historical_data': []
-    }
-    
-    print("Processing event performance data...")
-    # Event type performance
-    event_type_stats = analyzer.combined_data.groupby('EventTypeName').agg({
-        'Total Attendance': ['mean', 'std', 'count'],
-        'Transactions': ['mean', 'std'],
-        'Net Sales': ['mean', 'std'],
-        'Units': ['mean', 'std']
-    }).round(2)
-    
-    for event_type in event_type_stats.index:
-        cache['event_performance']['event_type_performance'][event_type] = {
-            'avg_attendance': event_type_stats.loc[event_type, ('Total Attendance', 'mean')],
-            'attendance_std': event_type_stats.loc[event_type, ('Total Attendance', 'std')],
-            'event_count': event_type_stats.loc[event_type, ('Total Attendance', 'count')],
-            'avg_transactions': event_type_stats.loc[event_type, ('Transactions', 'mean')],
-            'avg_sales': event_type_stats.loc[event_type, ('Net Sales', 'mean')],
-            'avg_units': event_type_stats.loc[event_type, ('Units', 'mean')]
-        }
-    
-    # Day of week performance
-    dow_stats = analyzer.combined_data.groupby('DayOfWeek').agg({
-        'Total Attendance': 'mean',
-        'Transactions': 'mean',
-        'Net Sales': 'mean'
-    }).round(2)
-    
-    for day in dow_stats.index:
-        cache['event_performance']['day_of_week_performance'][day] = {
-            'avg_attendance': dow_stats.loc[day, 'Total Attendance'],
-            'avg_transactions': dow_stats.loc[day, 'Transactions'],
-            'avg_sales': dow_stats.loc[day, 'Net Sales']
-        }
-    
-    print("🏪 Processing stand performance data...")
-    # Stand performance
-    stand_summary = analyzer.stand_pos.groupby('Stand Group').agg({
-        'Transactions': ['sum', 'mean'],
-        'Net Sales': ['sum', 'mean'],
-        'Units': ['sum', 'mean'],
-        'Total POS': 'mean'
-    }).round(2)
-    
-    stand_efficiency = analyzer.stand_pos.groupby('Stand Group').agg({
-        'Trans Per POS': 'mean',
-        'Units Per Trans': 'mean'
-    }).round(3)
-    
-    for stand_group in stand_summary.index:
-        cache['stand_performance'][stand_group] = {
-            'total_transactions': stand_summary.loc[stand_group, ('Transactions', 'sum')],
-            'avg_transactions': stand_summary.loc[stand_group, ('Transactions', 'mean')],
-            'total_sales': stand_summary.loc[stand_group, ('Net Sales', 'sum')],
-            'avg_sales': stand_summary.loc[stand_group, ('Net Sales', 'mean')],
-            'total_units': stand_summary.loc[stand_group, ('Units', 'sum')],
-            'avg_units': stand_summary.loc[stand_group, ('Units', 'mean')],
-            'avg_pos': stand_summary.loc[stand_group, ('Total POS', 'mean')],
-            'trans_per_pos': stand_efficiency.loc[stand_group, 'Trans Per POS'],
-            'units_per_trans': stand_efficiency.loc[stand_group, 'Units Per Trans']
-        }
-    
-    print("👥 Processing staffing recommendations...")
-    # Staffing recommendations
-    total_transactions = report['predictions']['Transactions']
-    stand_transaction_share = analyzer.stand_pos.groupby('Stand Group')['Transactions'].sum()
-    total_historical_transactions = stand_transaction_share.sum()
-    stand_share_pct = stand_transaction_share / total_historical_transactions
-    
-    total_pos = 0
-    for stand_group, share in stand_share_pct.items():
-        predicted_trans = total_transactions * share
-        stand_data = analyzer.stand_pos[analyzer.stand_pos['Stand Group'] == stand_group]
-        avg_trans_per_pos = stand_data['Trans Per POS'].mean()
-        pos_needed = max(1, round(predicted_trans / avg_trans_per_pos))
-        
-        staff_info = {
-            'stand_group': stand_group,
-            'predicted_transactions': round(predicted_trans),
-            'pos_terminals_needed': pos_needed,
-            'avg_trans_per_pos': round(avg_trans_per_pos, 1)
-        }
-        cache['staffing_recommendations']['staffing_by_stand'].append(staff_info)
-        total_pos += pos_needed
-    
-    cache['staffing_recommendations']['total_pos_needed'] = total_pos
-    cache['staffing_recommendations']['total_cashiers_needed'] = total_pos
-    
-    # Sync POS terminals between predictions and staffing for consistency
-    cache['march5_predictions']['predictions']['pos_terminals'] = total_pos
-    
-    print("📊 Processing historical data...")
-    # Historical data
-    for _, row in analyzer.combined_data.iterrows():
-        cache['historical_data'].append({
-            'date': row['Calendar Date'].isoformat(),
-            'event_type': row['EventTypeName'],
-            'opponent': row['Opponent'],
-            'attendance': int(row['Total Attendance']),
-            'transactions': int(row['Transactions']),
-            'net_sales': round(row['Net Sales'], 2),
-            'units': int(row['Units']),
-            'day_of_week': row['DayOfWeek'],
-            'trans_per_attendee': round(row['Trans_Per_Attendee'], 3),
-            'sales_per_attendee': round(row['Sales_Per_Attendee'], 2)
-        })
-    
-    # Calculate risk assessment gaps
-    cache['risk_assessment']['attendance_risk']['attendance_gap'] = (
-        cache['risk_assessment']['attendance_risk']['avg_nba_attendance'] - 10000
-    )
-    cache['risk_assessment']['revenue_risk']['performance_gap'] = round(
-        cache['risk_assessment']['revenue_risk']['avg_nba_trans_per_attendee'] - 
-        cache['risk_assessment']['revenue_risk']['predicted_trans_per_attendee'], 3
-    )
+    analyzer = SilverArenaAnalyzer(DATA_PATH, venue=venue)
+    analyzer.load_data()
+    analyzer.clean_data()
+    analyzer.exploratory_analysis()
+    
+    previous = {} if force else load_previous_cache(cache_file)
+    previous_fingerprints = previous.get('fingerprints', {})
+    fingerprints = section_fingerprints(analyzer)
+    stale = [
+        section for section in SECTIONS
+        if section not in previous or previous_fingerprints.get(section) != fingerprints[section]
+    ]
+    if not stale:
+        print("✅ Cache is up to date, nothing to rebuild")
+        return previous
+    print(f"Rebuilding sections: {', '.join(stale)}")
+    
+    # Models are only retrained when their own inputs changed
+    report = None
+    if any(SECTION_INPUTS[section].get('predictions') for section in stale):
+        predictions = previous.get('model_predictions')
+        simulation = previous.get('model_simulation')
+        if (predictions is None or simulation is None
+                or previous.get('model_fingerprint') != model_fingerprint(analyzer)):
+            print("📊 Loading prediction models...")
+            analyzer.load_or_build_models()
+            predictions = analyzer.predict_march_5_demand()
+            simulation = analyzer.simulate_march_5_demand()
+        else:
+            print("Reusing cached model predictions")
+        staffing_needs = analyzer.generate_staffing_recommendations(predictions)
+        report = analyzer.generate_summary_report(predictions, staffing_needs, simulation)
+    
+    built = PayloadBuilder(analyzer, report).build(stale)
+    cache = {'generated_at': datetime.now().isoformat(), 'venue': venue}
+    for section in SECTIONS:
+        cache[section] = built[section] if section in stale else previous[section]
+    cache['fingerprints'] = fingerprints
+    cache['model_fingerprint'] = model_fingerprint(analyzer)
+    # Lets scenario predictions size terminals with the same plan as the cached staffing section
+    cache['staffing_basis'] = analyzer.staffing_basis()
+    cache['model_predictions'] = report['predictions'] if report else previous.get('model_predictions')
+    # Only the model-dependent demand draws are reused; staffing risk is recomputed from the current plan
+    cache['model_simulation'] = simulation if report else previous.get('model_simulation')
     
     # Clean all data for JSON serialization
     cache = clean_for_json(cache)
     
-    # Save cache
-    cache_file = os.path.join(os.path.dirname(__file__), 'analysis_cache.json')
-    with open(cache_file, 'w') as f:
-        json.dump(cache, f, indent=2)
+    # Save cache atomically so readers never see a partially written file; a CLI run and the
+    # server's background refresh of the same venue each stage into their own temp file
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f, indent=2)
+    replace_file(cache_file, write)
     
     print(f"✅ Cache saved to {cache_file}")
     print(f"📦 Cache size: {os.path.getsize(cache_file) / 1024:.1f} KB")
     return cache
 
 if __name__ == "__main__":
-    cache = generate_cache()
-    print("🎉 Cache generation complete!") 
\ No newline at end of file
+    args = sys.argv[1:]
+    venue = args[args.index('--venue') + 1] if '--venue' in args else DEFAULT_VENUE
+    cache = generate_cache(force='--force' in args, venue=venue)
+    print("🎉 Cache generation complete!")
@@ -0,0 +1,59 @@
+"""
+Immutable, pre-encoded view of analysis_cache.json served by the fast backend
+"""
+
+import json
+import os
+import gzip
+import hashlib
+from datetime import datetime
+from historical_query import HistoricalIndex
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def encode_section(section):
+    """Serialize a section once to JSON bytes plus gzip and, if available, brotli variants"""
+    body = json.dumps(section, sort_keys=True, separators=(',', ':')).encode() + b'\n'
+    bodies = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9)}
+    if brotli is not None:
+        bodies['br'] = brotli.compress(body, quality=11)
+    return bodies
+
+class CacheSnapshot:
+    """Everything derived from one cache file; never mutated once built, only replaced"""
+    
+    def __init__(self, data, last_modified=None):
+        self.data = data
+        self.last_modified = last_modified
+        self.bodies = {name: encode_section(section) for name, section in data.items()}
+        self.etags = {
+            name: hashlib.sha256(bodies['identity']).hexdigest()[:32]
+            for name, bodies in self.bodies.items()
+        }
+        # historical_data regrouped by field and sorted by date, for filtered queries
+        records = data.get('historical_data', [])
+        self.historical_index = HistoricalIndex(
+            {field: [record[field] for record in records] for field in (records[0] if records else {})})
+        
+    @property
+    def generated_at(self):
+        return self.data.get('generated_at')
+        
+    @classmethod
+    def from_file(cls, path):
+        """Build a snapshot from a cache file, or an empty one if the file is missing"""
+        if not os.path.exists(path):
+            print(f"Cache file not found: {path}")
+            print("Run: python backend/cache_results.py to generate cache")
+            return cls({})
+        with open(path, 'r') as f:
+            data = json.load(f)
+        try:
+            last_modified = datetime.fromisoformat(data['generated_at']).astimezone()
+        except (KeyError, ValueError):
+            last_modified = datetime.fromtimestamp(os.path.getmtime(path)).astimezone()
+        print(f"Cache loaded from {path}")
+        return cls(data, last_modified)
@@ -0,0 +1,101 @@
+"""
+Date-indexed filtering, projection and cursor pagination for the historical series
+"""
+
+import base64
+import json
+import numpy as np
+
+MAX_PAGE_SIZE = 5000
+
+def encode_cursor(position):
+    """Opaque cursor for resuming after a row position"""
+    return base64.urlsafe_b64encode(json.dumps({'pos': position}).encode()).decode()
+
+def decode_cursor(cursor):
+    """Row position encoded in a cursor"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))['pos']
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(position, int) or position < 0:
+        raise ValueError("Invalid cursor")
+    return position
+
+def parse_date(value, end=False):
+    """Parse a start/end bound; a date-only end covers that whole day"""
+    try:
+        if len(value) == 10:
+            day = np.datetime64(value, 'D')
+            return (day + 1 if end else day).astype('datetime64[s]')
+        return np.datetime64(value, 's')
+    except ValueError:
+        raise ValueError(f"Invalid date: {value}")
+
+class HistoricalIndex:
+    """Historical rows held column-wise and sorted by date, so date ranges are a binary search"""
+    
+    def __init__(self, columns):
+        dates = np.array(columns.get('date', []), dtype='datetime64[s]')
+        order = np.argsort(dates, kind='stable')
+        self.dates = dates[order]
+        self.fields = list(columns)
+        self.columns = {field: [values[i] for i in order] for field, values in columns.items()}
+        self.arrays = {field: np.array(values, dtype=object) for field, values in self.columns.items()}
+        
+    def __len__(self):
+        return len(self.dates)
+        
+    def query(self, start=None, end=None, event_type=None, opponent=None, fields=None,
+              limit=None, cursor=None, format='records'):
+        """Return (rows, next_cursor) for a filtered, projected page of the series"""
+        fields = fields or self.fields
+        unknown = [field for field in fields if field not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        
+        # Binary search for the date range, then resume from the cursor inside it
+        lo = 0 if start is None else int(np.searchsorted(self.dates, parse_date(start), side='left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, parse_date(end, end=True), side='left'))
+        if cursor is not None:
+            lo = max(lo, decode_cursor(cursor))
+            
+        # Only the date slice is scanned for the equality filters
+        positions = np.arange(lo, max(lo, hi))
+        for field, value in (('event_type', event_type), ('opponent', opponent)):
+            if value is not None:
+                positions = positions[self.arrays[field][positions] == value]
+                
+        next_cursor = None
+        if limit is not None and len(positions) > limit:
+            next_cursor = encode_cursor(int(positions[limit]))
+            positions = positions[:limit]
+            
+        if format == 'columns':
+            rows = {field: [self.columns[field][i] for i in positions] for field in fields}
+        else:
+            projected = [self.columns[field] for field in fields]
+            rows = [{field: column[i] for field, column in zip(fields, projected)} for i in positions]
+        return rows, next_cursor
+
+def parse_query_args(args):
+    """Translate request query arguments into HistoricalIndex.query keyword arguments"""
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+    fields = args.get('fields')
+    return {
+        'start': args.get('start'),
+        'end': args.get('end'),
+        'event_type': args.get('event_type'),
+        'opponent': args.get('opponent'),
+        'fields': [field.strip() for field in fields.split(',') if field.strip()] if fields else None,
+        'limit': limit,
+        'cursor': args.get('cursor'),
+        'format': 'columns' if args.get('format') == 'columns' else 'records'
+    }
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for the API entry points, measured with python -X importtime
+"""
+
+import os
+import sys
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import time allowed per entry point, in milliseconds
+IMPORT_BUDGETS_MS = {
+    'app': 1500,
+    'app_fast': 1500
+}
+
+# Training and plotting stacks that must stay out of the serving import path
+FORBIDDEN_MODULES = ['matplotlib', 'seaborn', 'sklearn', 'scipy', 'joblib']
+
+RUNS = 3
+
+def measure(module):
+    """Cumulative import time of a module in a fresh interpreter, and any forbidden packages it loaded"""
+    code = (f"import sys, {module}; "
+            f"print(','.join(sorted({{name.split('.')[0] for name in sys.modules}} & set({FORBIDDEN_MODULES!r}))))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative_us = int(parts[1])
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return cumulative_us / 1000, loaded
+
+def check_budgets():
+    """Measure each entry point and report whether it stays within budget"""
+    scale = float(os.environ.get('SILVER_ARENA_IMPORT_BUDGET_SCALE', 1))
+    ok = True
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        # Best of several runs, so a busy machine does not fail the check
+        timings = [measure(module) for _ in range(RUNS)]
+        import_ms = min(ms for ms, _ in timings)
+        loaded = timings[0][1]
+        within = import_ms <= budget_ms * scale and not loaded
+        ok = ok and within
+        status = 'OK' if within else 'OVER BUDGET'
+        print(f"{module}: {import_ms:.0f}ms (budget {budget_ms * scale:.0f}ms) {status}")
+        if loaded:
+            print(f"  loads heavy modules at import: {', '.join(loaded)}")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if check_budgets() else 1)
@@ -0,0 +1,317 @@
+"""
+API payload builders shared by the live backend (app.py) and the cache generator
+"""
+
+import os
+import sys
+from functools import cached_property
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_analysis import MARCH_5_EVENT, DEMAND_PROFILES, DEFAULT_DEMAND_PROFILE, ERLANG_C_PARAMS
+
+SECTIONS = [
+    'overview',
+    'event_performance',
+    'stand_performance',
+    'march5_predictions',
+    'staffing_recommendations',
+    'risk_assessment',
+    'historical_data'
+]
+
+# Columns each section reads, by frame, and whether it depends on the model predictions
+STAFFING_INPUTS = {
+    'stand_pos': ['Stand Group', 'Transactions', 'Trans Per POS']
+}
+SECTION_INPUTS = {
+    'overview': {
+        'frames': {'combined_data': ['Calendar Date', 'EventTypeName', 'Total Attendance', 'Transactions',
+                                     'Net Sales', 'Trans_Per_Attendee', 'Sales_Per_Attendee',
+                                     'Sales_Per_Transaction']}
+    },
+    'event_performance': {
+        'frames': {'combined_data': ['EventTypeName', 'DayOfWeek', 'Total Attendance', 'Transactions',
+                                     'Net Sales', 'Units']}
+    },
+    'stand_performance': {
+        'frames': {'stand_pos': ['Stand Group', 'Transactions', 'Net Sales', 'Units', 'Total POS',
+                                 'Trans Per POS', 'Units Per Trans']}
+    },
+    'march5_predictions': {
+        'frames': STAFFING_INPUTS,
+        'predictions': True
+    },
+    'staffing_recommendations': {
+        'frames': STAFFING_INPUTS,
+        'predictions': True,
+        'params': [DEMAND_PROFILES, DEFAULT_DEMAND_PROFILE, ERLANG_C_PARAMS]
+    },
+    'risk_assessment': {
+        'frames': {'combined_data': ['EventTypeName', 'Total Attendance', 'Trans_Per_Attendee'], **STAFFING_INPUTS},
+        'predictions': True
+    },
+    'historical_data': {
+        'frames': {'combined_data': ['Calendar Date', 'EventTypeName', 'Opponent', 'Total Attendance',
+                                     'Transactions', 'Net Sales', 'Units', 'DayOfWeek',
+                                     'Trans_Per_Attendee', 'Sales_Per_Attendee']}
+    }
+}
+
+def serialize_numpy(obj):
+    """Convert numpy types to Python native types for JSON serialization"""
+    if hasattr(obj, 'item'):
+        return obj.item()
+    elif hasattr(obj, 'tolist'):
+        return obj.tolist()
+    elif isinstance(obj, (int, float, str, bool, list, dict, type(None))):
+        return obj
+    else:
+        return str(obj)
+
+def clean_for_json(data):
+    """Recursively clean data structure for JSON serialization"""
+    if isinstance(data, dict):
+        return {key: clean_for_json(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [clean_for_json(item) for item in data]
+    else:
+        return serialize_numpy(data)
+
+class PayloadBuilder:
+    """Builds API sections from one analyzer and report, computing shared intermediates once"""
+    
+    def __init__(self, analyzer, report=None):
+        self.analyzer = analyzer
+        self.report = report
+        self.expected_attendance = MARCH_5_EVENT['Total Attendance']
+        
+    def build(self, sections=None):
+        """Build the requested sections (all by default) as JSON-ready dicts"""
+        return {section: clean_for_json(getattr(self, section)()) for section in (sections or SECTIONS)}
+        
+    # Shared intermediates
+    
+    @cached_property
+    def combined_means(self):
+        """Column means over every event, used by the overview"""
+        return self.analyzer.combined_data[[
+            'Total Attendance', 'Transactions', 'Net Sales',
+            'Trans_Per_Attendee', 'Sales_Per_Attendee', 'Sales_Per_Transaction'
+        ]].mean()
+        
+    @cached_property
+    def nba_means(self):
+        """Column means over NBA regular season games, used by the risk assessment"""
+        combined_data = self.analyzer.combined_data
+        nba_games = combined_data[combined_data['EventTypeName'] == 'NBA Regular Season']
+        return nba_games[['Total Attendance', 'Trans_Per_Attendee']].mean()
+        
+    @cached_property
+    def staffing(self):
+        """Staffing rows and totals from the analyzer's recommendations"""
+        simulated = self.simulation['staffing']['by_stand'] if self.simulation else {}
+        rows = []
+        for stand_group, info in self.report['staffing_recommendations'].items():
+            row = {
+                'stand_group': stand_group,
+                'predicted_transactions': round(info['predicted_transactions']),
+                'pos_terminals_needed': int(info['pos_terminals_needed']),
+                'avg_trans_per_pos': round(info['avg_trans_per_pos'], 1)
+            }
+            if stand_group in simulated:
+                row['pos_terminals_p50'] = int(simulated[stand_group]['p50'])
+                row['pos_terminals_p90'] = int(simulated[stand_group]['p90'])
+            rows.append(row)
+        return rows, sum(row['pos_terminals_needed'] for row in rows)
+        
+    @cached_property
+    def interval_schedule(self):
+        """Terminals per stand group for each 15-minute interval of the March 5th game"""
+        events = pd.DataFrame([MARCH_5_EVENT])
+        total_transactions = self.report['predictions']['Transactions']
+        plan = self.analyzer.interval_staffing_plan(events, total_transactions)
+        # Queueing-based sizing of the same intervals, for comparison
+        erlang_plan = self.analyzer.interval_staffing_plan(events, total_transactions, mode='erlang_c')
+        schedule = []
+        for i, offset in enumerate(plan['interval_offsets']):
+            pos_needed = plan['pos_terminals_needed'][0, i]
+            schedule.append({
+                'interval_start': pd.Timestamp(plan['interval_starts'][0, i]).strftime('%H:%M'),
+                'minutes_from_start': offset,
+                'predicted_transactions': round(plan['predicted_transactions'][0, i].sum()),
+                'total_pos': int(pos_needed.sum()),
+                'total_pos_erlang_c': int(erlang_plan['total_pos_needed'][0, i]),
+                'pos_by_stand': dict(zip(plan['stand_groups'], pos_needed.astype(int).tolist()))
+            })
+        return schedule
+        
+    @property
+    def simulation(self):
+        """Monte Carlo demand and staffing percentiles, when the report has them"""
+        return self.report.get('simulation')
+        
+    # Sections
+    
+    def overview(self):
+        """High-level analysis overview"""
+        combined_data = self.analyzer.combined_data
+        means = self.combined_means
+        return {
+            'total_events_analyzed': len(combined_data),
+            'date_range': {
+                'start': combined_data['Calendar Date'].min().isoformat(),
+                'end': combined_data['Calendar Date'].max().isoformat()
+            },
+            'event_types': combined_data['EventTypeName'].unique().tolist(),
+            'avg_attendance': round(means['Total Attendance']),
+            'avg_transactions': round(means['Transactions']),
+            'avg_sales': round(means['Net Sales'], 2),
+            'key_metrics': {
+                'transactions_per_attendee': round(means['Trans_Per_Attendee'], 3),
+                'sales_per_attendee': round(means['Sales_Per_Attendee'], 2),
+                'sales_per_transaction': round(means['Sales_Per_Transaction'], 2)
+            }
+        }
+        
+    def event_performance(self):
+        """Event performance breakdown by type and day"""
+        event_type_stats = self.analyzer.aggregate('event_type')
+        event_type_performance = {}
+        for event_type in event_type_stats.index:
+            event_type_performance[event_type] = {
+                'avg_attendance': event_type_stats.loc[event_type, ('Total Attendance', 'mean')],
+                'attendance_std': event_type_stats.loc[event_type, ('Total Attendance', 'std')],
+                'event_count': event_type_stats.loc[event_type, ('Total Attendance', 'count')],
+                'avg_transactions': event_type_stats.loc[event_type, ('Transactions', 'mean')],
+                'avg_sales': event_type_stats.loc[event_type, ('Net Sales', 'mean')],
+                'avg_units': event_type_stats.loc[event_type, ('Units', 'mean')]
+            }
+            
+        dow_stats = self.analyzer.aggregate('day_of_week')
+        dow_performance = {}
+        for day in dow_stats.index:
+            dow_performance[day] = {
+                'avg_attendance': dow_stats.loc[day, 'Total Attendance'],
+                'avg_transactions': dow_stats.loc[day, 'Transactions'],
+                'avg_sales': dow_stats.loc[day, 'Net Sales']
+            }
+            
+        return {
+            'event_type_performance': event_type_performance,
+            'day_of_week_performance': dow_performance
+        }
+        
+    def stand_performance(self):
+        """Stand performance analysis"""
+        stand_summary = self.analyzer.aggregate('stand_summary')
+        stand_efficiency = self.analyzer.aggregate('stand_efficiency')
+        stand_performance = {}
+        for stand_group in stand_summary.index:
+            stand_performance[stand_group] = {
+                'total_transactions': stand_summary.loc[stand_group, ('Transactions', 'sum')],
+                'avg_transactions': stand_summary.loc[stand_group, ('Transactions', 'mean')],
+                'total_sales': stand_summary.loc[stand_group, ('Net Sales', 'sum')],
+                'avg_sales': stand_summary.loc[stand_group, ('Net Sales', 'mean')],
+                'total_units': stand_summary.loc[stand_group, ('Units', 'sum')],
+                'avg_units': stand_summary.loc[stand_group, ('Units', 'mean')],
+                'avg_pos': stand_summary.loc[stand_group, ('Total POS', 'mean')],
+                'trans_per_pos': stand_efficiency.loc[stand_group, 'Trans Per POS'],
+                'units_per_trans': stand_efficiency.loc[stand_group, 'Units Per Trans']
+            }
+        return stand_performance
+        
+    def march5_predictions(self):
+        """Predictions for the March 5th game"""
+        predictions = self.report['predictions']
+        _, total_pos = self.staffing
+        return {
+            'event_details': self.report['event_details'],
+            'predictions': {
+                'transactions': round(predictions['Transactions']),
+                'net_sales': round(predictions['Net Sales'], 2),
+                'units': round(predictions['Units']),
+                # Sync POS terminals between predictions and staffing for consistency
+                'pos_terminals': total_pos
+            },
+            'derived_metrics': {
+                'trans_per_attendee': round(predictions['Transactions'] / self.expected_attendance, 3),
+                'sales_per_attendee': round(predictions['Net Sales'] / self.expected_attendance, 2),
+                'sales_per_transaction': round(predictions['Net Sales'] / predictions['Transactions'], 2)
+            },
+            'key_insights': self.report['key_insights']
+        }
+        
+    def staffing_recommendations(self):
+        """Staffing recommendations for the March 5th game"""
+        rows, total_pos = self.staffing
+        section = {
+            'staffing_by_stand': rows,
+            'total_pos_needed': total_pos,
+            'total_cashiers_needed': total_pos,
+            'interval_schedule': self.interval_schedule,
+            'recommendations': [
+                "Focus staffing during peak pre-game and halftime periods",
+                "Monitor beverage and grill stands for highest transaction volumes",
+                "Have backup staff ready for unexpected demand spikes",
+                "Consider promoting higher-margin items to boost revenue per transaction"
+            ]
+        }
+        if self.simulation:
+            section['total_pos_p50'] = int(self.simulation['staffing']['total_pos_p50'])
+            section['total_pos_p90'] = int(self.simulation['staffing']['total_pos_p90'])
+        return section
+        
+    def risk_assessment(self):
+        """Risk assessment and opportunities"""
+        avg_nba_attendance = self.nba_means['Total Attendance']
+        avg_nba_trans_per_attendee = self.nba_means['Trans_Per_Attendee']
+        predicted_trans_per_attendee = self.report['predictions']['Transactions'] / self.expected_attendance
+        section = {
+            'attendance_risk': {
+                'predicted_attendance': self.expected_attendance,
+                'avg_nba_attendance': round(avg_nba_attendance),
+                'attendance_gap': round(avg_nba_attendance - self.expected_attendance),
+                'risk_level': 'Medium' if avg_nba_attendance - self.expected_attendance > 2000 else 'Low'
+            },
+            'revenue_risk': {
+                'predicted_trans_per_attendee': round(predicted_trans_per_attendee, 3),
+                'avg_nba_trans_per_attendee': round(avg_nba_trans_per_attendee, 3),
+                'performance_gap': round(avg_nba_trans_per_attendee - predicted_trans_per_attendee, 3)
+            },
+            'operational_risks': [
+                "Lower attendance may reduce economies of scale",
+                "Sunday afternoon timing may affect concession preferences",
+                "Potential for longer lines if understaffed",
+                "Weather could impact attendance and concession sales"
+            ],
+            'opportunities': [
+                "Family-friendly promotions for Sunday afternoon game",
+                "Focus on higher-margin items to boost per-transaction revenue",
+                "Implement mobile ordering to reduce wait times",
+                "Cross-sell complementary items at high-traffic stands"
+            ],
+            'mitigation_strategies': [
+                "Have flexible staffing model to adjust POS terminals as needed",
+                "Monitor real-time queue lengths and adjust staffing",
+                "Prepare promotional materials for slower-moving inventory",
+                "Ensure backup payment systems are available"
+            ]
+        }
+        if self.simulation:
+            staffing = self.simulation['staffing']
+            section['demand_distribution'] = {
+                target: {name: round(value, 2) for name, value in summary.items()}
+                for target, summary in self.simulation['demand'].items()
+            }
+            section['staffing_risk'] = {
+                'simulated_draws': self.simulation['n_draws'],
+                'total_pos_p50': int(staffing['total_pos_p50']),
+                'total_pos_p90': int(staffing['total_pos_p90']),
+                'shortfall_probability': round(staffing['shortfall_probability'], 3)
+            }
+        return section
+        
+    def historical_data(self):
+        """Historical event rows for charts"""
+        return self.analyzer.historical_records()
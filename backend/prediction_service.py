@@ -0,0 +1,154 @@
+"""
+Scenario predictions for the API, with concurrent requests coalesced into batches
+"""
+
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+import pandas as pd
+from data_analysis import terminals_for_demand
+
+# Request field -> predict_events column
+REQUEST_FIELDS = {
+    'date': 'Calendar Date',
+    'time': 'Event Time',
+    'event_type': 'EventTypeName',
+    'opponent': 'Opponent',
+    'expected_attendance': 'Total Attendance'
+}
+
+def parse_prediction_request(payload):
+    """Validate a scenario request body and convert it to a predict_events row"""
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    missing = [field for field in REQUEST_FIELDS if payload.get(field) in (None, '')]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    
+    event = {column: payload[field] for field, column in REQUEST_FIELDS.items()}
+    try:
+        event['Calendar Date'] = pd.Timestamp(event['Calendar Date'])
+        pd.to_datetime(str(event['Event Time']), format='mixed')
+        event['Total Attendance'] = float(event['Total Attendance'])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid event description: {e}")
+    if not math.isfinite(event['Total Attendance']) or event['Total Attendance'] <= 0:
+        raise ValueError("expected_attendance must be a positive finite number")
+    return event
+
+# Source column of a label-encoded feature -> request field it comes from
+LABEL_REQUEST_FIELDS = {
+    'EventTypeName': 'event_type',
+    'Opponent': 'opponent',
+    'DayOfWeek': 'date'
+}
+
+def check_event_labels(event, predictor):
+    """Reject event types the models never saw; return request fields predicted with a fallback encoding"""
+    unseen = predictor.unseen_labels(pd.DataFrame([event]))
+    if 'EventTypeName' in unseen:
+        known = ', '.join(predictor.label_classes('event_type'))
+        raise ValueError(f"Unknown event_type: {event['EventTypeName']}. Known event types: {known}")
+    return [LABEL_REQUEST_FIELDS[source] for source in unseen]
+
+def staffing_basis_from_rows(rows):
+    """Approximate staffing basis from cached staffing rows, for caches written before staffing_basis"""
+    transactions = np.array([row['predicted_transactions'] for row in rows], dtype=float)
+    return {
+        'stand_groups': [row['stand_group'] for row in rows],
+        'shares': (transactions / transactions.sum()).tolist() if transactions.sum() else transactions.tolist(),
+        'avg_trans_per_pos': [row['avg_trans_per_pos'] for row in rows]
+    }
+
+def format_prediction(event, predictions, staffing_basis, fallback_fields=None):
+    """Shape one event's predictions like the March 5th endpoint, with terminals from the staffing plan"""
+    attendance = event['Total Attendance']
+    _, pos_needed = terminals_for_demand(predictions['Transactions'], staffing_basis['shares'],
+                                         staffing_basis['avg_trans_per_pos'])
+    return {
+        "event_details": {
+            "date": event['Calendar Date'].date().isoformat(),
+            "time": str(event['Event Time']),
+            "event_type": event['EventTypeName'],
+            "opponent": event['Opponent'],
+            "expected_attendance": attendance,
+            "venue": event.get('Venue Name')
+        },
+        "predictions": {
+            "transactions": round(predictions['Transactions']),
+            "net_sales": round(predictions['Net Sales'], 2),
+            "units": round(predictions['Units']),
+            "pos_terminals": int(pos_needed.sum())
+        },
+        "derived_metrics": {
+            "trans_per_attendee": round(predictions['Transactions'] / attendance, 3),
+            "sales_per_attendee": round(predictions['Net Sales'] / attendance, 2),
+            "sales_per_transaction": round(predictions['Net Sales'] / predictions['Transactions'], 2)
+            if predictions['Transactions'] else 0
+        },
+        # Values the models were not trained on, predicted as if they were the first known label
+        "fallback_fields": fallback_fields or []
+    }
+
+class PredictionBatcher:
+    """Collects events arriving within a short window and predicts them with one call per set of models"""
+    
+    def __init__(self, window_seconds=0.005, max_batch_size=256):
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        
+    def predict(self, event, predictor, timeout=30):
+        """Predict one event with the caller's already loaded models, sharing a call with concurrent requests"""
+        return self.submit(event, predictor).result(timeout)
+        
+    def submit(self, event, predictor):
+        """Queue one event with its predictor and return a Future for its per-target predictions"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((event, predictor, future))
+        return future
+        
+    def _ensure_worker(self):
+        """Start the batching thread on first use"""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='prediction-batcher', daemon=True)
+                self._worker.start()
+                
+    def _run(self):
+        """Drain the queue in windows, predicting each window as one batch"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._predict_batch(batch)
+            
+    def _predict_batch(self, batch):
+        """Run one model call per predictor in a batch and resolve each request's Future"""
+        # Predictors were resolved in the request threads, so this thread never loads a venue
+        groups = {}
+        for event, predictor, future in batch:
+            groups.setdefault(id(predictor), (predictor, []))[1].append((event, future))
+        for predictor, requests in groups.values():
+            events = pd.DataFrame([event for event, _ in requests])
+            try:
+                predictions = predictor.predict_events(events)
+            except Exception as e:
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+            for i, (_, future) in enumerate(requests):
+                future.set_result({target: float(values[i]) for target, values in predictions.items()})
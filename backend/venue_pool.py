@@ -0,0 +1,69 @@
+"""
+Per-venue state loaded on demand, keeping only the most recently used venues in memory
+"""
+
+import threading
+from collections import OrderedDict
+
+class VenuePool:
+    """Loads each venue's state on first use and evicts the least recently used beyond max_venues"""
+
+    def __init__(self, loader, max_venues=4):
+        self.loader = loader
+        self.max_venues = max(1, max_venues)
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get(self, venue):
+        """A venue's state, loading it once even when many requests ask for it at the same time"""
+        with self._lock:
+            if venue in self._entries:
+                self._entries.move_to_end(venue)
+                return self._entries[venue]
+            venue_lock = self._loading.setdefault(venue, threading.Lock())
+        # Loads of different venues run in parallel; callers for the same venue wait for one load
+        with venue_lock:
+            with self._lock:
+                if venue in self._entries:
+                    self._entries.move_to_end(venue)
+                    return self._entries[venue]
+            try:
+                state = self.loader(venue)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(venue, None)
+                raise
+            # Publish and stop loading in one step, so no caller sees the venue as neither
+            with self._lock:
+                self._store(venue, state)
+                self._loading.pop(venue, None)
+            return state
+
+    def put(self, venue, state):
+        """Store or replace a venue's state, evicting idle venues over capacity"""
+        with self._lock:
+            self._store(venue, state)
+
+    def _store(self, venue, state):
+        """Insert a venue's state; the caller holds the lock"""
+        self._entries[venue] = state
+        self._entries.move_to_end(venue)
+        while len(self._entries) > self.max_venues:
+            evicted, _ = self._entries.popitem(last=False)
+            print(f"Evicted idle venue {evicted}")
+
+    def peek(self, venue):
+        """A venue's state if it is loaded, without loading it or marking it as used"""
+        with self._lock:
+            return self._entries.get(venue)
+
+    def discard(self, venue):
+        """Drop a venue's state so the next request loads it afresh"""
+        with self._lock:
+            self._entries.pop(venue, None)
+
+    def venues(self):
+        """Loaded venues, least recently used first"""
+        with self._lock:
+            return list(self._entries)
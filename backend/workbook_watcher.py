@@ -0,0 +1,96 @@
+"""
+Watches the source workbook and triggers a cache rebuild once changes settle
+"""
+
+import os
+import threading
+import time
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+class _WakeHandler(FileSystemEventHandler):
+    """Wakes the watcher thread on any event in the workbook's directory"""
+    
+    def __init__(self, wake):
+        self.wake = wake
+        
+    def on_any_event(self, event):
+        self.wake.set()
+
+class WorkbookWatcher:
+    """Calls on_change after the workbook changes and then stays unchanged for debounce seconds
+    
+    Uses inotify (via the optional watchdog package) when available, otherwise polls.
+    """
+    
+    def __init__(self, path, on_change, poll_interval=2.0, debounce=5.0):
+        self.path = path
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._observer = None
+        
+    def signature(self):
+        """Cheap change marker for the workbook; None while it is missing"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+        
+    def start(self):
+        """Start watching in a daemon thread"""
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(_WakeHandler(self._wake), os.path.dirname(os.path.abspath(self.path)))
+            self._observer.daemon = True
+            self._observer.start()
+        self._thread = threading.Thread(target=self._run, name='workbook-watcher', daemon=True)
+        self._thread.start()
+        mode = 'inotify' if self._observer is not None else f"polling every {self.poll_interval}s"
+        print(f"Watching {self.path} ({mode}, {self.debounce}s debounce)")
+        
+    def stop(self):
+        """Stop watching"""
+        self._stopped.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+            
+    def _run(self):
+        """Track the workbook signature and fire once it has been stable long enough"""
+        baseline = self.signature()
+        pending = None
+        changed_at = None
+        while not self._stopped.is_set():
+            # With inotify, only wake on a timer while waiting out the debounce window
+            timeout = self.poll_interval if self._observer is None or pending is not None else None
+            self._wake.wait(timeout)
+            self._wake.clear()
+            
+            current = self.signature()
+            if current is None:
+                # Mid-replace; wait for the new file to appear
+                continue
+            if current == baseline:
+                pending = None
+                continue
+            if current != pending:
+                # A new or further change restarts the debounce window
+                pending, changed_at = current, time.monotonic()
+                continue
+            if time.monotonic() - changed_at >= self.debounce:
+                baseline, pending = current, None
+                print(f"Workbook changed: {self.path}")
+                try:
+                    self.on_change()
+                except Exception as e:
+                    print(f"Workbook change handler failed: {e}")
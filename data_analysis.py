@@ -1,36 +1,426 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+import os
+import json
+import hashlib
+import importlib
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from model_registry import ModelRegistry
 import warnings
 warnings.filterwarnings('ignore')
 
+# Workbook sheets and the analyzer attribute each one is loaded into
+SHEETS = {
+    'event_chars': 'Event Characteristics Data',
+    'event_pos': 'Event Point of Sale Data',
+    'stand_pos': 'Stand Point of Sale Data'
+}
+SNAPSHOT_VERSION = 1
+
+# Venue served when a request or job does not name one
+DEFAULT_VENUE = 'Silver Arena'
+
+# Everything that determines the fitted models; changing it invalidates the registry
+MODEL_PARAMS = {
+    'feature_cols': ['Total Attendance', 'EventType_Encoded', 'Opponent_Encoded',
+                     'DayOfWeek_Encoded', 'Month', 'Hour', 'IsWeekend'],
+    'targets': ['Transactions', 'Net Sales', 'Units', 'Total POS'],
+    'test_size': 0.2,
+    'random_state': 42,
+    'estimators': {
+        'RandomForest': {'n_estimators': 100, 'random_state': 42},
+        'GradientBoosting': {'random_state': 42},
+        'LinearRegression': {}
+    }
+}
+# Raw combined_data columns the models are trained on
+MODEL_INPUT_COLUMNS = ['Total Attendance', 'EventTypeName', 'Opponent', 'DayOfWeek', 'Month', 'Hour',
+                       'IsWeekend', 'Transactions', 'Net Sales', 'Units', 'Total POS']
+
+# Estimator classes by module path; sklearn is only imported once training or simulation needs it
+ESTIMATORS = {
+    'RandomForest': ('sklearn.ensemble', 'RandomForestRegressor'),
+    'GradientBoosting': ('sklearn.ensemble', 'GradientBoostingRegressor'),
+    'LinearRegression': ('sklearn.linear_model', 'LinearRegression')
+}
+
+def estimator_class(name):
+    """Import and return the estimator class registered under a name"""
+    module_name, class_name = ESTIMATORS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+def fit_candidate(target, name, params, X_train, y_train, X_test, y_test):
+    """Fit one (target, estimator) pair and score it on the held-out split"""
+    from sklearn.metrics import r2_score
+    model = estimator_class(name)(**params)
+    model.fit(X_train, y_train)
+    score = r2_score(y_test, model.predict(X_test))
+    return target, name, model, score
+
+MODEL_MODES = ('per_target', 'multi_output')
+
+# Training workers start fresh interpreters: forking a server process that runs
+# request, batcher and push threads can deadlock on locks those threads hold
+TRAIN_START_METHOD = 'spawn'
+
+# Rollups shared by the analysis, the live API and the cache: (frame, group column, agg spec, decimals)
+AGGREGATE_SPECS = {
+    'event_type': ('combined_data', 'EventTypeName', {
+        'Total Attendance': ['mean', 'std', 'count'],
+        'Transactions': ['mean', 'std'],
+        'Net Sales': ['mean', 'std'],
+        'Units': ['mean', 'std']
+    }, 2),
+    'day_of_week': ('combined_data', 'DayOfWeek', {
+        'Total Attendance': 'mean',
+        'Transactions': 'mean',
+        'Net Sales': 'mean'
+    }, 2),
+    'stand_summary': ('stand_pos', 'Stand Group', {
+        'Transactions': ['sum', 'mean'],
+        'Net Sales': ['sum', 'mean'],
+        'Units': ['sum', 'mean'],
+        'Total POS': 'mean'
+    }, 2),
+    'stand_efficiency': ('stand_pos', 'Stand Group', {
+        'Trans Per POS': 'mean',
+        'Units Per Trans': 'mean'
+    }, 3),
+    # Unrounded, since staffing needs are computed from it
+    'stand_staffing': ('stand_pos', 'Stand Group', {
+        'Transactions': 'sum',
+        'Trans Per POS': 'mean'
+    }, None)
+}
+
+# combined_data column -> (API field, decimal places or None) for the historical series
+HISTORICAL_FIELDS = {
+    'Calendar Date': ('date', None),
+    'EventTypeName': ('event_type', None),
+    'Opponent': ('opponent', None),
+    'Total Attendance': ('attendance', None),
+    'Transactions': ('transactions', None),
+    'Net Sales': ('net_sales', 2),
+    'Units': ('units', None),
+    'DayOfWeek': ('day_of_week', None),
+    'Trans_Per_Attendee': ('trans_per_attendee', 3),
+    'Sales_Per_Attendee': ('sales_per_attendee', 2)
+}
+
+# Columns kept after compaction and the low-cardinality ones stored as categoricals.
+# Venue Name stays so data from several venues can share one frame.
+COMPACT_COLUMNS = {
+    'combined_data': ['Venue Name', 'Calendar Date', 'Event Time', 'EventTypeName', 'Opponent',
+                      'Total Attendance', 'DayOfWeek', 'Month', 'Hour', 'IsWeekend',
+                      'Transactions', 'Units', 'Net Sales', 'Total POS'],
+    'stand_pos': ['Venue Name', 'Calendar Date', 'Stand Group', 'Transactions', 'Units', 'Net Sales',
+                  'Total POS', 'Units Per Trans', 'Trans Per POS']
+}
+CATEGORICAL_COLUMNS = ['Venue Name', 'EventTypeName', 'Opponent', 'DayOfWeek', 'Stand Group']
+
+# Columns describing a future event, as accepted by predict_events
+EVENT_COLUMNS = ['Calendar Date', 'Event Time', 'EventTypeName', 'Opponent', 'Total Attendance']
+
+# Label-encoded event features: (feature column, source column, encoder name)
+LABEL_FEATURES = [('EventType_Encoded', 'EventTypeName', 'event_type'),
+                  ('Opponent_Encoded', 'Opponent', 'opponent'),
+                  ('DayOfWeek_Encoded', 'DayOfWeek', 'day')]
+MARCH_5_EVENT = {
+    'Calendar Date': '2023-03-05',
+    'Event Time': '14:00:00',  # 2 PM Eastern
+    'EventTypeName': 'NBA Regular Season',
+    'Opponent': 'Oklahoma City Thunder',
+    'Total Attendance': 10000
+}
+
+# Relative transaction volume per 15-minute interval, starting 90 minutes before Event Time.
+# The workbook has no intraday sales, so these shapes encode the usual pre-game rush and
+# halftime (NBA) or intermission (NHL) peaks; pass a custom profile to override them.
+INTERVAL_MINUTES = 15
+INTERVAL_START_OFFSET = -90
+DEMAND_PROFILES = {
+    'NBA Regular Season': [3, 5, 8, 11, 12, 10, 6, 5, 5, 6, 10, 8, 4, 3, 2, 2],
+    'NHL Regular Season': [3, 5, 8, 10, 11, 9, 4, 4, 9, 9, 4, 4, 8, 7, 3, 2]
+}
+DEFAULT_DEMAND_PROFILE = [3, 5, 8, 10, 11, 9, 6, 6, 7, 7, 7, 6, 5, 4, 3, 3]
+
+# Staffing modes: terminal throughput from history, or Erlang C (M/M/c) queueing against a service level
+STAFFING_MODES = ('throughput', 'erlang_c')
+ERLANG_C_PARAMS = {
+    'service_seconds': 45,  # Average time to serve one transaction
+    'service_level': 0.8,  # Share of customers served within the target wait
+    'target_wait_seconds': 120
+}
+
+# Monte Carlo draws per event, the percentiles reported for simulated demand, and the points of the
+# transaction quantile grid kept for pricing staffing plans (every 0.1%)
+SIMULATION_DRAWS = 10000
+SIMULATION_PERCENTILES = [10, 50, 90]
+SIMULATION_QUANTILES = 1001
+
+def add_calendar_features(df):
+    """Add DayOfWeek, Month, Hour and IsWeekend derived from date and event time"""
+    df['DayOfWeek'] = df['Calendar Date'].dt.day_name()
+    df['Month'] = df['Calendar Date'].dt.month
+    df['Hour'] = pd.to_datetime(df['Event Time'].astype(str), format='mixed').dt.hour
+    df['IsWeekend'] = df['DayOfWeek'].isin(['Saturday', 'Sunday'])
+    return df
+
+def compact_frame(df, columns):
+    """Keep only the given columns, with categorical strings and the smallest integer types"""
+    df = df[columns].copy()
+    for column in columns:
+        if column in CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype('category')
+        elif pd.api.types.is_integer_dtype(df[column]):
+            # Floats stay float64 so sums and means match the uncompacted data exactly
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+    return df
+
+def frame_memory_mb(df):
+    """Deep memory footprint of a frame in megabytes"""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+def encode_labels(encoder, values):
+    """Vectorized LabelEncoder.transform that maps unseen labels to -1 instead of raising"""
+    return pd.Categorical(values, categories=encoder.classes_).codes.astype(np.int64)
+
+def terminals_for_demand(total_transactions, shares, avg_trans_per_pos):
+    """Predicted transactions and POS terminals per stand for totals of any shape, stand groups on the last axis"""
+    predicted_trans = np.asarray(total_transactions, dtype=float)[..., np.newaxis] * np.asarray(shares, dtype=float)
+    # fmax keeps at least one terminal even where the efficiency is missing
+    return predicted_trans, np.fmax(1, np.ceil(predicted_trans / np.asarray(avg_trans_per_pos, dtype=float)))
+
+def interval_profile(event_types, profiles=None):
+    """Normalized demand share per interval for each event type, shape (n_events, n_intervals)"""
+    profiles = DEMAND_PROFILES if profiles is None else profiles
+    weights = np.array([profiles.get(event_type, DEFAULT_DEMAND_PROFILE) for event_type in event_types],
+                       dtype=float)
+    return weights / weights.sum(axis=1, keepdims=True)
+
+def erlang_c_terminals(arrival_rates, service_seconds=None, service_level=None, target_wait_seconds=None,
+                       max_terminals=1000):
+    """Fewest terminals per cell meeting the service level, for arrival rates in transactions per second"""
+    service_seconds = ERLANG_C_PARAMS['service_seconds'] if service_seconds is None else service_seconds
+    service_level = ERLANG_C_PARAMS['service_level'] if service_level is None else service_level
+    target_wait_seconds = ERLANG_C_PARAMS['target_wait_seconds'] if target_wait_seconds is None else target_wait_seconds
+    
+    # Offered load in Erlangs, broadcast against per-stand service times
+    load = np.asarray(arrival_rates, dtype=float) * service_seconds
+    terminals = np.zeros(load.shape)
+    erlang_b = np.ones(load.shape)
+    for c in range(1, max_terminals + 1):
+        # Stable Erlang B recurrence, advanced for every unsized cell at once
+        erlang_b = load * erlang_b / (c + load * erlang_b)
+        unsized = terminals == 0
+        if not unsized.any():
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            erlang_c = erlang_b / (1 - load / c * (1 - erlang_b))
+            met = 1 - erlang_c * np.exp(-(c - load) * target_wait_seconds / service_seconds)
+        # A queue is only stable with more terminals than Erlangs of load
+        terminals[unsized & (c > load) & (met >= service_level)] = c
+    if (terminals == 0).any():
+        raise ValueError(f"Load needs more than {max_terminals} terminals in some cells")
+    return terminals
+
+def percentile_summary(values, method='linear'):
+    """Mean and SIMULATION_PERCENTILES of simulated draws along the first axis"""
+    summary = {'mean': np.mean(values, axis=0)}
+    for p, value in zip(SIMULATION_PERCENTILES, np.percentile(values, SIMULATION_PERCENTILES, axis=0, method=method)):
+        summary[f'p{p}'] = value
+    return summary
+
+def train_workers(n_jobs=None):
+    """Worker count for model training, from the argument or SILVER_ARENA_TRAIN_WORKERS; in-process by default"""
+    # A spawned worker spends longer importing pandas and sklearn than the whole serial fit takes on
+    # this dataset, so process workers are opt-in for larger training sets
+    if n_jobs is None:
+        n_jobs = int(os.environ.get('SILVER_ARENA_TRAIN_WORKERS', 1))
+    return max(1, n_jobs)
+
+def venue_slug(venue):
+    """Filesystem-safe name for a venue's registry directory and cache file"""
+    return ''.join(c if c.isalnum() else '-' for c in venue.lower()).strip('-')
+
+def registry_dir_for(data_path, venue=None):
+    """Model registry directory of a workbook, per venue when one is given"""
+    registry_dir = os.path.join(os.path.dirname(os.path.abspath(data_path)), '.models')
+    return os.path.join(registry_dir, venue_slug(venue)) if venue is not None else registry_dir
+
+def replace_file(path, write):
+    """Write a file through a temp file private to this writer, then atomically move it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        # mkstemp creates owner-only files; snapshots are shared like the rest of the tree
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Hash a file's contents without reading it into memory at once"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def frame_fingerprint(df, columns=None):
+    """Hash the contents of selected DataFrame columns, independent of index"""
+    columns = list(df.columns) if columns is None else list(columns)
+    digest = hashlib.sha256(json.dumps(columns).encode())
+    digest.update(pd.util.hash_pandas_object(df[columns], index=False).values.tobytes())
+    return digest.hexdigest()
+
 class SilverArenaAnalyzer:
-    def __init__(self, data_path):
+    def __init__(self, data_path, n_jobs=None, model_mode=None, venue=None):
         self.data_path = data_path
+        # Only this venue's rows are loaded, and its models are registered separately; None loads every venue
+        self.venue = venue
+        self.n_jobs = n_jobs
+        self.model_mode = model_mode or os.environ.get('SILVER_ARENA_MODEL_MODE', 'per_target')
+        if self.model_mode not in MODEL_MODES:
+            raise ValueError(f"Unknown model mode {self.model_mode!r}, expected one of {MODEL_MODES}")
         self.event_chars = None
         self.event_pos = None
         self.stand_pos = None
         self.combined_data = None
         self.models = {}
+        # Bumped whenever the frames change; memoized aggregates belong to one version
+        self.data_version = 0
+        self._aggregates = {}
+        self.registry = ModelRegistry(registry_dir_for(data_path, venue))
         
     def load_data(self):
-        """Load all data from Excel file"""
-        print("Loading data from Excel file...")
-        self.event_chars = pd.read_excel(self.data_path, sheet_name='Event Characteristics Data')
-        self.event_pos = pd.read_excel(self.data_path, sheet_name='Event Point of Sale Data')
-        self.stand_pos = pd.read_excel(self.data_path, sheet_name='Stand Point of Sale Data')
+        """Load all data, preferring the columnar snapshot over the Excel file"""
+        frames = self.read_snapshot(venue=self.venue)
+        if frames is None:
+            print("Loading data from Excel file...")
+            frames = {
+                key: pd.read_excel(self.data_path, sheet_name=sheet)
+                for key, sheet in SHEETS.items()
+            }
+            self.write_snapshot(frames)
+            if self.venue is not None:
+                frames = {
+                    key: df[df['Venue Name'] == self.venue].reset_index(drop=True)
+                    for key, df in frames.items()
+                }
+        else:
+            print("Loading data from snapshot...")
+        if self.venue is not None and frames['event_chars'].empty:
+            raise ValueError(f"Unknown venue {self.venue!r}")
+            
+        self.event_chars = frames['event_chars']
+        self.event_pos = frames['event_pos']
+        self.stand_pos = frames['stand_pos']
+        
+        self.data_changed()
         
         print(f"Event Characteristics: {self.event_chars.shape}")
         print(f"Event POS Data: {self.event_pos.shape}")
         print(f"Stand POS Data: {self.stand_pos.shape}")
         
+    def data_changed(self):
+        """Start a new data version, dropping aggregates memoized for the old one"""
+        self.data_version += 1
+        self._aggregates = {}
+        
+    def aggregate(self, name):
+        """Rollup from AGGREGATE_SPECS, computed once per data version; treat it as read-only"""
+        if name not in self._aggregates:
+            frame, group_col, spec, decimals = AGGREGATE_SPECS[name]
+            rollup = getattr(self, frame).groupby(group_col, observed=True).agg(spec)
+            self._aggregates[name] = rollup if decimals is None else rollup.round(decimals)
+        return self._aggregates[name]
+        
+    def venues(self):
+        """Venue names in the workbook, read from the snapshot's venue column when possible"""
+        frames = self.read_snapshot(columns=['Venue Name'])
+        if frames is None:
+            # Builds the snapshot as a side effect, so later calls are cheap
+            SilverArenaAnalyzer(self.data_path).load_data()
+            frames = self.read_snapshot(columns=['Venue Name'])
+        return sorted(frames['event_chars']['Venue Name'].dropna().unique().tolist())
+        
+    def snapshot_dir(self):
+        """Directory holding the Parquet snapshot of the workbook"""
+        return os.path.join(os.path.dirname(os.path.abspath(self.data_path)), '.snapshot',
+                            os.path.basename(self.data_path))
+        
+    def read_snapshot(self, columns=None, venue=None):
+        """Read the workbook snapshot, optionally only some columns or one venue's rows; None if missing or stale"""
+        manifest_path = os.path.join(self.snapshot_dir(), 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != SNAPSHOT_VERSION:
+            return None
+            
+        # mtime and size are checked first; the hash is only needed when they differ
+        stat = os.stat(self.data_path)
+        if (manifest.get('mtime_ns'), manifest.get('size')) != (stat.st_mtime_ns, stat.st_size):
+            if manifest.get('sha256') != file_sha256(self.data_path):
+                return None
+            manifest['mtime_ns'] = stat.st_mtime_ns
+            manifest['size'] = stat.st_size
+            self._write_json(manifest_path, manifest)
+            
+        try:
+            # Venue rows are filtered inside the Parquet reader, so other venues are never materialized
+            filters = [('Venue Name', '==', venue)] if venue is not None else None
+            return {
+                key: pd.read_parquet(os.path.join(self.snapshot_dir(), f"{key}.parquet"), memory_map=True,
+                                     columns=columns, filters=filters)
+                for key in SHEETS
+            }
+        except (ImportError, OSError, ValueError) as e:
+            print(f"Snapshot unreadable, falling back to Excel: {e}")
+            return None
+            
+    def write_snapshot(self, frames):
+        """Write the loaded sheets as Parquet files keyed by the workbook's mtime and hash"""
+        snapshot_dir = self.snapshot_dir()
+        stat = os.stat(self.data_path)
+        manifest = {
+            'version': SNAPSHOT_VERSION,
+            'source': os.path.basename(self.data_path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': file_sha256(self.data_path),
+            'sheets': SHEETS
+        }
+        try:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            for key, df in frames.items():
+                path = os.path.join(snapshot_dir, f"{key}.parquet")
+                # Concurrent writers each use their own temp file, so neither clobbers the other
+                replace_file(path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+        except (ImportError, OSError, ValueError) as e:
+            print(f"Snapshot not written: {e}")
+            return
+        # The manifest goes last so a partial write is never treated as valid
+        self._write_json(os.path.join(snapshot_dir, 'manifest.json'), manifest)
+        print(f"Snapshot written to {snapshot_dir}")
+        
+    def _write_json(self, path, data):
+        """Atomically replace a JSON file"""
+        def write(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+        replace_file(path, write)
+        
     def clean_data(self):
         """Clean and prepare data for analysis"""
         print("Cleaning data...")
@@ -40,10 +430,7 @@ class SilverArenaAnalyzer:
             df['Calendar Date'] = pd.to_datetime(df['Calendar Date'])
             
         # Add derived features to event characteristics
-        self.event_chars['DayOfWeek'] = self.event_chars['Calendar Date'].dt.day_name()
-        self.event_chars['Month'] = self.event_chars['Calendar Date'].dt.month
-        self.event_chars['Hour'] = pd.to_datetime(self.event_chars['Event Time'], format='%H:%M:%S').dt.hour
-        self.event_chars['IsWeekend'] = self.event_chars['DayOfWeek'].isin(['Saturday', 'Sunday'])
+        add_calendar_features(self.event_chars)
         
         # Combine event characteristics with event POS data
         self.combined_data = self.event_chars.merge(
@@ -51,10 +438,22 @@ class SilverArenaAnalyzer:
             on=['Venue Name', 'Calendar Date'], 
             how='inner'
         )
+        self.compact_data()
+        
+        self.data_changed()
         
         print("Data cleaning completed.")
         print(f"Combined dataset shape: {self.combined_data.shape}")
         
+    def compact_data(self):
+        """Drop unused columns and shrink dtypes of the frames the analysis keeps, reporting the savings"""
+        for frame_name, columns in COMPACT_COLUMNS.items():
+            frame = getattr(self, frame_name)
+            before_mb = frame_memory_mb(frame)
+            compacted = compact_frame(frame, columns)
+            setattr(self, frame_name, compacted)
+            print(f"Compacted {frame_name}: {before_mb:.2f} MB -> {frame_memory_mb(compacted):.2f} MB")
+            
     def exploratory_analysis(self):
         """Perform exploratory data analysis"""
         print("Performing exploratory data analysis...")
@@ -67,21 +466,10 @@ class SilverArenaAnalyzer:
         print(self.combined_data['Transactions'].describe())
         
         print("\n=== EVENT TYPE BREAKDOWN ===")
-        event_summary = self.combined_data.groupby('EventTypeName').agg({
-            'Total Attendance': ['mean', 'std', 'count'],
-            'Transactions': ['mean', 'std'],
-            'Net Sales': ['mean', 'std'],
-            'Units': ['mean', 'std']
-        }).round(2)
-        print(event_summary)
+        print(self.aggregate('event_type'))
         
         print("\n=== DAY OF WEEK ANALYSIS ===")
-        dow_summary = self.combined_data.groupby('DayOfWeek').agg({
-            'Total Attendance': 'mean',
-            'Transactions': 'mean',
-            'Net Sales': 'mean'
-        }).round(2)
-        print(dow_summary)
+        print(self.aggregate('day_of_week'))
         
         # Calculate key metrics
         self.combined_data['Trans_Per_Attendee'] = self.combined_data['Transactions'] / self.combined_data['Total Attendance']
@@ -93,22 +481,31 @@ class SilverArenaAnalyzer:
         print(f"Average Sales per Attendee: ${self.combined_data['Sales_Per_Attendee'].mean():.2f}")
         print(f"Average Sales per Transaction: ${self.combined_data['Sales_Per_Transaction'].mean():.2f}")
         
+    def historical_frame(self):
+        """Historical event series with API field names, rounded and date-formatted column-wise"""
+        historical = pd.DataFrame({
+            field: self.combined_data[column] if decimals is None else self.combined_data[column].round(decimals)
+            for column, (field, decimals) in HISTORICAL_FIELDS.items()
+        })
+        historical['date'] = historical['date'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+        return historical
+        
+    def historical_records(self):
+        """Historical event series as a list of row dicts"""
+        return self.historical_frame().to_dict('records')
+        
+    def historical_columns(self):
+        """Historical event series as one list per field, without per-row objects"""
+        return self.historical_frame().to_dict('list')
+        
     def analyze_stand_performance(self):
         """Analyze performance by stand type"""
         print("\n=== STAND PERFORMANCE ANALYSIS ===")
         
-        stand_summary = self.stand_pos.groupby('Stand Group').agg({
-            'Transactions': ['sum', 'mean'],
-            'Net Sales': ['sum', 'mean'],
-            'Units': ['sum', 'mean'],
-            'Total POS': 'mean'
-        }).round(2)
+        stand_summary = self.aggregate('stand_summary')
         
         # Calculate efficiency metrics
-        stand_efficiency = self.stand_pos.groupby('Stand Group').agg({
-            'Trans Per POS': 'mean',
-            'Units Per Trans': 'mean'
-        }).round(3)
+        stand_efficiency = self.aggregate('stand_efficiency')
         
         print("Stand Group Performance Summary:")
         print(stand_summary)
@@ -117,11 +514,14 @@ class SilverArenaAnalyzer:
         
         return stand_summary, stand_efficiency
         
-    def build_prediction_models(self):
-        """Build models to predict transactions and sales"""
-        print("\nBuilding prediction models...")
+    def model_params(self):
+        """Hyperparameters plus model mode, as used to key the registry"""
+        return dict(MODEL_PARAMS, mode=self.model_mode)
         
-        # Prepare features for modeling
+    def prepare_training_data(self):
+        """Encode categorical features and split rows into train and test sets"""
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import LabelEncoder
         features_df = self.combined_data.copy()
         
         # Encode categorical variables
@@ -132,38 +532,61 @@ class SilverArenaAnalyzer:
         features_df['EventType_Encoded'] = le_event_type.fit_transform(features_df['EventTypeName'])
         features_df['Opponent_Encoded'] = le_opponent.fit_transform(features_df['Opponent'])
         features_df['DayOfWeek_Encoded'] = le_day.fit_transform(features_df['DayOfWeek'])
+        encoders = {
+            'event_type': le_event_type,
+            'opponent': le_opponent,
+            'day': le_day
+        }
+        
+        # Every target shares the same split, since X and the seed are the same
+        train_idx, test_idx = train_test_split(
+            features_df.index, test_size=MODEL_PARAMS['test_size'], random_state=MODEL_PARAMS['random_state'])
+        return features_df, encoders, train_idx, test_idx
+        
+    def build_prediction_models(self):
+        """Build models to predict transactions and sales"""
+        if self.model_mode == 'multi_output':
+            self.build_multi_output_model()
+            return
+        print("\nBuilding prediction models...")
+        
+        # Prepare features for modeling
+        features_df, encoders, train_idx, test_idx = self.prepare_training_data()
         
         # Select features
-        feature_cols = ['Total Attendance', 'EventType_Encoded', 'Opponent_Encoded', 
-                       'DayOfWeek_Encoded', 'Month', 'Hour', 'IsWeekend']
+        feature_cols = MODEL_PARAMS['feature_cols']
         
         X = features_df[feature_cols]
         
         # Build models for different targets
-        targets = ['Transactions', 'Net Sales', 'Units', 'Total POS']
-        
+        targets = MODEL_PARAMS['targets']
+        X_train, X_test = X.loc[train_idx], X.loc[test_idx]
+        
+        # Each (target, model) fit is independent, with seeds fixed in MODEL_PARAMS
+        jobs = [
+            (target, name, params, X_train, features_df.loc[train_idx, target],
+             X_test, features_df.loc[test_idx, target])
+            for target in targets
+            for name, params in MODEL_PARAMS['estimators'].items()
+        ]
+        n_workers = min(train_workers(self.n_jobs), len(jobs))
+        print(f"Training {len(jobs)} models with {n_workers} worker(s)...")
+        if n_workers == 1:
+            results = [fit_candidate(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers,
+                                     mp_context=multiprocessing.get_context(TRAIN_START_METHOD)) as executor:
+                results = list(executor.map(fit_candidate, *zip(*jobs)))
+        
+        # Results come back in submission order, so ties resolve exactly as a serial loop would
         for target in targets:
             print(f"\nTraining model for {target}...")
-            y = features_df[target]
-            
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-            
-            # Train multiple models
-            models = {
-                'RandomForest': RandomForestRegressor(n_estimators=100, random_state=42),
-                'GradientBoosting': GradientBoostingRegressor(random_state=42),
-                'LinearRegression': LinearRegression()
-            }
-            
             best_model = None
             best_score = float('-inf')
             
-            for name, model in models.items():
-                model.fit(X_train, y_train)
-                y_pred = model.predict(X_test)
-                score = r2_score(y_test, y_pred)
-                
+            for result_target, name, model, score in results:
+                if result_target != target:
+                    continue
                 print(f"{name} R² Score: {score:.3f}")
                 
                 if score > best_score:
@@ -173,40 +596,211 @@ class SilverArenaAnalyzer:
             self.models[target] = {
                 'model': best_model,
                 'score': best_score,
-                'encoders': {
-                    'event_type': le_event_type,
-                    'opponent': le_opponent,
-                    'day': le_day
-                }
+                'feature_names': list(best_model.feature_names_in_),
+                'encoders': encoders
             }
             
-    def predict_march_5_demand(self):
-        """Predict demand for March 5th Oklahoma City Thunder game"""
-        print("\n=== MARCH 5TH DEMAND PREDICTION ===")
+    def build_multi_output_model(self):
+        """Fit one RandomForest on all targets stacked, shared by every target"""
+        from sklearn.metrics import r2_score
+        print("\nBuilding multi-output prediction model...")
+        features_df, encoders, train_idx, test_idx = self.prepare_training_data()
+        feature_cols = MODEL_PARAMS['feature_cols']
+        targets = MODEL_PARAMS['targets']
+        
+        model = estimator_class('RandomForest')(**MODEL_PARAMS['estimators']['RandomForest'])
+        model.fit(features_df.loc[train_idx, feature_cols], features_df.loc[train_idx, targets])
+        y_pred = model.predict(features_df.loc[test_idx, feature_cols])
+        
+        for i, target in enumerate(targets):
+            score = r2_score(features_df.loc[test_idx, target], y_pred[:, i])
+            print(f"{target} multi-output RandomForest R² Score: {score:.3f}")
+            self.models[target] = {
+                'model': model,
+                'output_index': i,
+                'score': score,
+                'feature_names': list(model.feature_names_in_),
+                'encoders': encoders
+            }
+            
+    def load_latest_models(self):
+        """Load the most recently registered models without loading any data"""
+        entry = self.registry.load_latest()
+        if entry is None:
+            return False
+        self.models = entry['models']
+        return True
+        
+    def predict_targets(self, X):
+        """Predict every target for a feature frame, calling each distinct model once"""
+        outputs = {}
+        predictions = {}
+        for target, model_info in self.models.items():
+            model = model_info['model']
+            if id(model) not in outputs:
+                outputs[id(model)] = np.asarray(model.predict(X[model_info['feature_names']]))
+            output = outputs[id(model)]
+            predictions[target] = output[:, model_info['output_index']] if output.ndim == 2 else output
+        return predictions
         
-        # Game details
-        march_5_date = datetime(2023, 3, 5)
-        expected_attendance = 10000
-        
-        # Create feature vector for March 5th
-        march_5_features = {
-            'Total Attendance': expected_attendance,
-            'EventType_Encoded': 0,  # NBA (assuming similar to existing NBA games)
-            'Opponent_Encoded': 0,   # Will use average opponent effect
-            'DayOfWeek_Encoded': 6,  # Sunday (March 5, 2023 was a Sunday)
-            'Month': 3,
-            'Hour': 14,  # 2 PM Eastern
-            'IsWeekend': 1
+    def compare_model_modes(self, n_predict_rows=1000):
+        """Compare accuracy and fit/predict cost of the per-target and multi-output modes"""
+        import time
+        # Candidates are fitted in place; whatever models were loaded come back afterwards
+        mode = self.model_mode
+        models = self.models
+        features_df, _, _, _ = self.prepare_training_data()
+        X = features_df[MODEL_PARAMS['feature_cols']]
+        X_batch = X.sample(n_predict_rows, replace=True, random_state=MODEL_PARAMS['random_state'])
+        
+        comparison = {}
+        try:
+            for candidate in MODEL_MODES:
+                self.model_mode = candidate
+                self.models = {}
+                start = time.perf_counter()
+                self.build_prediction_models()
+                fit_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                self.predict_targets(X_batch)
+                predict_seconds = time.perf_counter() - start
+                comparison[candidate] = {
+                    'fit_seconds': fit_seconds,
+                    'predict_seconds': predict_seconds,
+                    'scores': {target: info['score'] for target, info in self.models.items()}
+                }
+        finally:
+            self.model_mode = mode
+            self.models = models
+            
+        print(f"\n=== MODEL MODE COMPARISON ({n_predict_rows} prediction rows) ===")
+        for candidate, result in comparison.items():
+            scores = ', '.join(f"{target} {score:.3f}" for target, score in result['scores'].items())
+            print(f"{candidate}: fit {result['fit_seconds']:.2f}s, predict {result['predict_seconds'] * 1000:.1f}ms, R² {scores}")
+        return comparison
+        
+    def training_fingerprint(self):
+        """Fingerprint of the data the prediction models are trained on"""
+        return frame_fingerprint(self.combined_data, MODEL_INPUT_COLUMNS)
+        
+    def load_or_build_models(self):
+        """Load fitted models from the registry, training only if data or params changed"""
+        entry = self.registry.load(self.training_fingerprint(), self.model_params())
+        if entry is None:
+            # Another worker may be training the same models; wait for it rather than duplicate the work
+            with self.registry.lock():
+                entry = self.registry.load(self.training_fingerprint(), self.model_params())
+                if entry is None:
+                    self.build_prediction_models()
+                    self.registry.save(self.models, self.training_fingerprint(), self.model_params())
+                    return
+        print("\nLoaded prediction models from registry")
+        self.models = entry['models']
+        for target, model_info in self.models.items():
+            print(f"{target}: {type(model_info['model']).__name__} R² Score: {model_info['score']:.3f}")
+        
+    def event_calendar(self, events):
+        """EVENT_COLUMNS of a DataFrame of future events with the calendar features derived from them"""
+        missing = [col for col in EVENT_COLUMNS if col not in events.columns]
+        if missing:
+            raise ValueError(f"Events are missing columns: {missing}")
+        features_df = events[EVENT_COLUMNS].copy()
+        features_df['Calendar Date'] = pd.to_datetime(features_df['Calendar Date'])
+        add_calendar_features(features_df)
+        return features_df
+        
+    def event_features(self, events):
+        """Model feature frame for a DataFrame of future events"""
+        features_df = self.event_calendar(events)
+        
+        # Labels the encoders have never seen fall back to code 0
+        encoders = next(iter(self.models.values()))['encoders']
+        for column, source, encoder_name in LABEL_FEATURES:
+            codes = encode_labels(encoders[encoder_name], features_df[source])
+            if (codes < 0).any():
+                unseen = sorted(set(features_df.loc[codes < 0, source]))
+                print(f"Unseen {source} values, using fallback encoding: {unseen}")
+            features_df[column] = np.maximum(codes, 0)
+        return features_df
+        
+    def unseen_labels(self, events):
+        """Source column -> values of a DataFrame of future events that the trained encoders have never seen"""
+        features_df = self.event_calendar(events)
+        encoders = next(iter(self.models.values()))['encoders']
+        unseen = {}
+        for _, source, encoder_name in LABEL_FEATURES:
+            codes = encode_labels(encoders[encoder_name], features_df[source])
+            if (codes < 0).any():
+                unseen[source] = sorted(set(features_df.loc[codes < 0, source]))
+        return unseen
+        
+    def label_classes(self, encoder_name):
+        """Labels an encoder was trained on"""
+        return list(next(iter(self.models.values()))['encoders'][encoder_name].classes_)
+        
+    def predict_events(self, events):
+        """Predict every target for a DataFrame of future events in one vectorized pass"""
+        return {
+            target: np.maximum(values, 0)  # Ensure non-negative
+            for target, values in self.predict_targets(self.event_features(events)).items()
         }
         
-        # Make predictions
-        predictions = {}
+    def holdout_residuals(self):
+        """Actual minus predicted value of every target on the held-out test events"""
+        features_df, _, _, test_idx = self.prepare_training_data()
+        test_df = features_df.loc[test_idx]
+        predictions = self.predict_targets(test_df)
+        return {
+            target: test_df[target].to_numpy(dtype=float) - values
+            for target, values in predictions.items()
+        }
         
+    def simulate_events(self, events, n_draws=SIMULATION_DRAWS, seed=None):
+        """Draw plausible outcomes of every target for each event, as arrays of shape (n_draws, n_events)"""
+        features_df = self.event_features(events)
+        n_events = len(features_df)
+        rng = np.random.default_rng(MODEL_PARAMS['random_state'] if seed is None else seed)
+        point_predictions = self.predict_targets(features_df)
+        event_columns = np.arange(n_events)
+        
+        # Draw indices are shared across targets so each draw stays jointly consistent
+        tree_outputs = {}
+        tree_index = None
+        residuals = None
+        residual_index = None
+        draws = {}
+        forest_class = estimator_class('RandomForest')
         for target, model_info in self.models.items():
             model = model_info['model']
-            feature_vector = np.array([[march_5_features[col] for col in model.feature_names_in_]])
-            prediction = model.predict(feature_vector)[0]
-            predictions[target] = max(0, prediction)  # Ensure non-negative
+            if isinstance(model, forest_class):
+                # Forests sample the prediction of a random tree
+                if id(model) not in tree_outputs:
+                    X = features_df[model_info['feature_names']].to_numpy(dtype=float)
+                    tree_outputs[id(model)] = np.stack([tree.predict(X) for tree in model.estimators_])
+                output = tree_outputs[id(model)]
+                if output.ndim == 3:
+                    output = output[:, :, model_info['output_index']]
+                if tree_index is None:
+                    tree_index = rng.integers(len(output), size=(n_draws, n_events))
+                values = output[tree_index, event_columns]
+            else:
+                # Other models add a bootstrapped held-out residual to the point prediction
+                if residuals is None:
+                    residuals = self.holdout_residuals()
+                    residual_index = rng.integers(len(residuals[target]), size=(n_draws, n_events))
+                values = point_predictions[target] + residuals[target][residual_index]
+            draws[target] = np.maximum(values, 0)
+        return draws
+        
+    def predict_march_5_demand(self):
+        """Predict demand for March 5th Oklahoma City Thunder game"""
+        print("\n=== MARCH 5TH DEMAND PREDICTION ===")
+        
+        expected_attendance = MARCH_5_EVENT['Total Attendance']
+        predictions = {
+            target: values[0]
+            for target, values in self.predict_events(pd.DataFrame([MARCH_5_EVENT])).items()
+        }
             
         print(f"Expected Attendance: {expected_attendance:,}")
         print(f"Predicted Transactions: {predictions['Transactions']:,.0f}")
@@ -226,40 +820,133 @@ class SilverArenaAnalyzer:
         
         return predictions
         
+    def simulate_march_5_demand(self, n_draws=SIMULATION_DRAWS):
+        """Demand percentiles and a transaction quantile grid for the March 5th game from Monte Carlo draws"""
+        print(f"\n=== MARCH 5TH DEMAND SIMULATION ({n_draws:,} draws) ===")
+        
+        draws = {
+            target: values[:, 0]
+            for target, values in self.simulate_events(pd.DataFrame([MARCH_5_EVENT]), n_draws).items()
+        }
+        simulation = {
+            'n_draws': n_draws,
+            'demand': {target: percentile_summary(values) for target, values in draws.items()},
+            # Actual draws at every 0.1%, enough to price any staffing plan without the model
+            'transaction_quantiles': np.percentile(draws['Transactions'], np.linspace(0, 100, SIMULATION_QUANTILES),
+                                                   method='higher').tolist()
+        }
+        
+        for target, summary in simulation['demand'].items():
+            print(f"{target}: P10 {summary['p10']:,.0f}, P50 {summary['p50']:,.0f}, P90 {summary['p90']:,.0f}")
+        
+        return simulation
+        
+    def simulation_staffing(self, simulation, predictions):
+        """Terminal percentiles and shortfall risk of the current staffing plan under simulated demand"""
+        quantiles = np.asarray(simulation['transaction_quantiles'], dtype=float)
+        plan = self.staffing_plan(quantiles)
+        point_total_pos = self.staffing_plan(predictions['Transactions'])['total_pos_needed']
+        
+        # Terminals grow monotonically with transactions, so the plan at a demand quantile is its percentile
+        grid = {p: round(p / 100 * (len(quantiles) - 1)) for p in SIMULATION_PERCENTILES}
+        staffing = {
+            'by_stand': {
+                stand_group: {'p50': plan['pos_terminals_needed'][grid[50], i],
+                              'p90': plan['pos_terminals_needed'][grid[90], i]}
+                for i, stand_group in enumerate(plan['stand_groups'])
+            },
+            'total_pos_p50': plan['total_pos_needed'][grid[50]],
+            'total_pos_p90': plan['total_pos_needed'][grid[90]],
+            # Share of demand quantiles needing more terminals than the point-estimate plan provides
+            'shortfall_probability': np.mean(plan['total_pos_needed'] > point_total_pos)
+        }
+        
+        print(f"POS Terminals: P50 {staffing['total_pos_p50']:.0f}, P90 {staffing['total_pos_p90']:.0f} "
+              f"(point plan short in {staffing['shortfall_probability']:.0%} of draws)")
+        
+        return staffing
+        
+    def staffing_basis(self):
+        """Historical transaction share and average efficiency of each stand type, as plain lists"""
+        stand_stats = self.aggregate('stand_staffing')
+        return {
+            'stand_groups': stand_stats.index.tolist(),
+            'shares': (stand_stats['Transactions'] / stand_stats['Transactions'].sum()).tolist(),
+            'avg_trans_per_pos': stand_stats['Trans Per POS'].tolist()
+        }
+        
+    def staffing_plan(self, total_transactions):
+        """POS terminals per stand group for one predicted transaction total or an array of them"""
+        basis = self.staffing_basis()
+        shares = np.asarray(basis['shares'])
+        avg_trans_per_pos = np.asarray(basis['avg_trans_per_pos'])
+        predicted_trans, pos_needed = terminals_for_demand(total_transactions, shares, avg_trans_per_pos)
+        
+        return {
+            'stand_groups': basis['stand_groups'],
+            'shares': shares,
+            'avg_trans_per_pos': avg_trans_per_pos,
+            'predicted_transactions': predicted_trans,
+            'pos_terminals_needed': pos_needed,
+            'total_pos_needed': pos_needed.sum(axis=-1)
+        }
+        
+    def interval_staffing_plan(self, events, total_transactions, profiles=None, mode='throughput', **erlang_params):
+        """POS terminals per stand group and 15-minute interval for each event, as (events, intervals, stands) arrays"""
+        if mode not in STAFFING_MODES:
+            raise ValueError(f"Unknown staffing mode {mode!r}, expected one of {STAFFING_MODES}")
+        missing = [col for col in ['Calendar Date', 'Event Time', 'EventTypeName'] if col not in events.columns]
+        if missing:
+            raise ValueError(f"Events are missing columns: {missing}")
+        plan = self.staffing_plan(total_transactions)
+        profile = interval_profile(events['EventTypeName'], profiles)
+        
+        # Interval start times relative to each event's start
+        offsets = INTERVAL_START_OFFSET + INTERVAL_MINUTES * np.arange(profile.shape[1])
+        event_starts = (pd.to_datetime(events['Calendar Date']).dt.normalize()
+                        + pd.to_timedelta(events['Event Time'].astype(str))).to_numpy()
+        interval_starts = event_starts[:, np.newaxis] + offsets.astype('timedelta64[m]')
+        
+        predicted_trans = plan['predicted_transactions'][..., np.newaxis, :] * profile[..., np.newaxis]
+        if mode == 'erlang_c':
+            pos_needed = erlang_c_terminals(predicted_trans / (INTERVAL_MINUTES * 60), **erlang_params)
+        else:
+            # Historical terminal counts are assumed to be sized for the busiest interval, so a terminal
+            # serves avg_trans_per_pos * peak share per interval and the peak matches the event-level plan
+            capacity = plan['avg_trans_per_pos'] * profile.max(axis=1)[:, np.newaxis, np.newaxis]
+            pos_needed = np.fmax(1, np.ceil(predicted_trans / capacity))
+        
+        return {
+            'stand_groups': plan['stand_groups'],
+            'interval_offsets': offsets,
+            'interval_starts': interval_starts,
+            'predicted_transactions': predicted_trans,
+            'pos_terminals_needed': pos_needed,
+            'total_pos_needed': pos_needed.sum(axis=-1)
+        }
+        
     def generate_staffing_recommendations(self, predictions):
         """Generate staffing recommendations based on predictions"""
         print("\n=== STAFFING RECOMMENDATIONS ===")
         
-        total_transactions = predictions['Transactions']
-        
-        # Calculate transactions per stand type based on historical data
-        stand_transaction_share = self.stand_pos.groupby('Stand Group')['Transactions'].sum()
-        total_historical_transactions = stand_transaction_share.sum()
-        stand_share_pct = stand_transaction_share / total_historical_transactions
+        plan = self.staffing_plan(predictions['Transactions'])
         
         print("Predicted transactions by stand type:")
         staffing_needs = {}
         
-        for stand_group, share in stand_share_pct.items():
-            predicted_trans = total_transactions * share
-            
-            # Get average efficiency for this stand type
-            stand_data = self.stand_pos[self.stand_pos['Stand Group'] == stand_group]
-            avg_trans_per_pos = stand_data['Trans Per POS'].mean()
-            
-            # Calculate POS terminals needed
-            pos_needed = max(1, np.ceil(predicted_trans / avg_trans_per_pos))
-            
+        for i, stand_group in enumerate(plan['stand_groups']):
+            predicted_trans = plan['predicted_transactions'][i]
+            pos_needed = plan['pos_terminals_needed'][i]
             staffing_needs[stand_group] = {
                 'predicted_transactions': predicted_trans,
                 'pos_terminals_needed': pos_needed,
-                'avg_trans_per_pos': avg_trans_per_pos
+                'avg_trans_per_pos': plan['avg_trans_per_pos'][i]
             }
             
             print(f"{stand_group}: {predicted_trans:.0f} transactions, {pos_needed:.0f} POS terminals")
             
         # Overall staffing recommendation
-        total_pos_needed = sum([info['pos_terminals_needed'] for info in staffing_needs.values()])
+        total_pos_needed = plan['total_pos_needed']
         
         print(f"\nTotal POS Terminals Recommended: {total_pos_needed:.0f}")
         print(f"Total Cashiers Needed (assuming 1 per traditional POS): {total_pos_needed:.0f}")
@@ -274,7 +961,7 @@ class SilverArenaAnalyzer:
         
         return staffing_needs
         
-    def generate_summary_report(self, predictions, staffing_needs):
+    def generate_summary_report(self, predictions, staffing_needs, simulation=None):
         """Generate executive summary report"""
         report = {
             'event_details': {
@@ -292,6 +979,9 @@ class SilverArenaAnalyzer:
                 "Monitor beverage stands closely as they typically see highest volume"
             ]
         }
+        if simulation is not None:
+            # Staffing risk always follows the current plan, even when the demand draws are reused
+            report['simulation'] = dict(simulation, staffing=self.simulation_staffing(simulation, predictions))
         return report
         
     def run_full_analysis(self):
@@ -300,15 +990,22 @@ class SilverArenaAnalyzer:
         self.clean_data()
         self.exploratory_analysis()
         self.analyze_stand_performance()
-        self.build_prediction_models()
+        self.load_or_build_models()
         predictions = self.predict_march_5_demand()
         staffing_needs = self.generate_staffing_recommendations(predictions)
-        report = self.generate_summary_report(predictions, staffing_needs)
+        simulation = self.simulate_march_5_demand()
+        report = self.generate_summary_report(predictions, staffing_needs, simulation)
         
         return report
 
 if __name__ == "__main__":
+    import sys
     analyzer = SilverArenaAnalyzer('data/Demand Planning - Case Data Final 2023.xlsx')
+    if '--compare-modes' in sys.argv[1:]:
+        analyzer.load_data()
+        analyzer.clean_data()
+        analyzer.compare_model_modes()
+        sys.exit(0)
     report = analyzer.run_full_analysis()
     print("\n" + "="*50)
     print("ANALYSIS COMPLETE - Report generated successfully!")
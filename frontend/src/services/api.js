@@ -34,6 +34,30 @@ const getDataWithFallback = async (endpoint, fallbackData) => {
   }
 };
 
+// Subscribe to pushed snapshot changes and live aggregates instead of polling.
+// Returns a function that closes the stream.
+const subscribeToLiveMetrics = ({ onSnapshot, onLive, onError } = {}, venue) => {
+  if (useStaticData || typeof EventSource === 'undefined') {
+    // Static data never changes, so there is nothing to subscribe to
+    return () => {};
+  }
+
+  const query = venue ? `?venue=${encodeURIComponent(venue)}` : '';
+  const source = new EventSource(`${API_BASE_URL}/api/stream${query}`);
+  const handle = (callback) => (event) => {
+    if (callback) {
+      callback(JSON.parse(event.data));
+    }
+  };
+
+  source.addEventListener('snapshot', handle(onSnapshot));
+  source.addEventListener('live', handle(onLive));
+  // The browser reconnects on its own after errors
+  source.onerror = (error) => onError && onError(error);
+
+  return () => source.close();
+};
+
 const apiService = {
   // Analysis endpoints
   getAnalysisOverview: () => getDataWithFallback('/api/analysis/overview', mockData.overview),
@@ -53,6 +77,9 @@ const apiService = {
   
   // Risk assessment
   getRiskAssessment: () => getDataWithFallback('/api/risk-assessment', mockData.risk_assessment),
+
+  // Push channel
+  subscribeToLiveMetrics,
 };
 
 export default apiService;
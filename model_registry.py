@@ -0,0 +1,105 @@
+"""
+Versioned on-disk registry of fitted prediction models
+"""
+
+import os
+import json
+import hashlib
+from contextlib import contextmanager
+from importlib.metadata import version
+
+# joblib and sklearn are imported on first load/save, keeping the registry cheap to import
+SKLEARN_VERSION = version('scikit-learn')
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+REGISTRY_VERSION = 1
+
+class ModelRegistry:
+    def __init__(self, registry_dir):
+        self.registry_dir = registry_dir
+        
+    def key(self, data_fingerprint, params):
+        """Registry key for a training-data fingerprint and hyperparameter set"""
+        payload = json.dumps({
+            'registry_version': REGISTRY_VERSION,
+            'sklearn_version': SKLEARN_VERSION,
+            'data_fingerprint': data_fingerprint,
+            'params': params
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+        
+    def path(self, key):
+        """File holding the models stored under a key"""
+        return os.path.join(self.registry_dir, f"models-{key}.joblib")
+        
+    def load(self, data_fingerprint, params):
+        """Load models trained on this data with these params, or None if absent"""
+        return self._load_path(self.path(self.key(data_fingerprint, params)))
+        
+    def load_latest(self):
+        """Load the most recently saved models regardless of fingerprint, or None"""
+        latest_path = os.path.join(self.registry_dir, 'latest.json')
+        if not os.path.exists(latest_path):
+            return None
+        try:
+            with open(latest_path, 'r') as f:
+                key = json.load(f)['key']
+        except (OSError, ValueError, KeyError):
+            return None
+        return self._load_path(self.path(key))
+        
+    def _load_path(self, path):
+        """Load and validate one registry entry"""
+        if not os.path.exists(path):
+            return None
+        import joblib
+        try:
+            entry = joblib.load(path)
+        except Exception as e:
+            print(f"Ignoring unreadable model registry entry {path}: {e}")
+            return None
+        if entry.get('registry_version') != REGISTRY_VERSION or entry.get('sklearn_version') != SKLEARN_VERSION:
+            return None
+        return entry
+        
+    @contextmanager
+    def lock(self):
+        """Exclusive lock across processes so only one worker trains at a time (no-op without fcntl)"""
+        os.makedirs(self.registry_dir, exist_ok=True)
+        with open(os.path.join(self.registry_dir, '.lock'), 'w') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                    
+    def save(self, models, data_fingerprint, params):
+        """Store fitted models with their training fingerprint and params"""
+        key = self.key(data_fingerprint, params)
+        entry = {
+            'registry_version': REGISTRY_VERSION,
+            'sklearn_version': SKLEARN_VERSION,
+            'data_fingerprint': data_fingerprint,
+            'params': params,
+            'models': models
+        }
+        import joblib
+        # data_analysis imports this module, so its shared writer is imported at call time
+        from data_analysis import replace_file
+        os.makedirs(self.registry_dir, exist_ok=True)
+        path = self.path(key)
+        # Each writer stages into its own temp file, so concurrent saves never clobber each other
+        replace_file(path, lambda tmp_path: joblib.dump(entry, tmp_path))
+        
+        def write_latest(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump({'key': key, 'data_fingerprint': data_fingerprint}, f, indent=2)
+        replace_file(os.path.join(self.registry_dir, 'latest.json'), write_latest)
+        print(f"Models saved to {path}")
+        return key